@@ -1,12 +1,42 @@
 import math
+import gc
+import bisect
+import heapq
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from array import array
 
 #Quetion 1
 
+EMPTY_LINK = array('i',[0])*27
+DENSE_CHILDREN = 8
+SNAPSHOT_HEADER = struct.Struct("<4sI4Q")
+SNAPSHOT_MAGIC = b"TRIE"
+SNAPSHOT_VERSION = 1
+DEFINITION_BITS = 32
+
 class Node:
+    __slots__ = ("keys","kids","base","end","definition","frequency","next_word_highest_freq_index","current_max_frequency",
+                 "unique_freq","top_words","word","best_terminal","cached","ranking","frequencies")
+
     def __init__(self,data=[None,0]):
         """
         Function description:
             init function is used to initialise a Node object. 
+            The children of a node are kept in one of 2 kinds of table, which is switched as children are added and removed:
+                (1) Sparse : self.keys is a string of the characters of the children in sorted order, self.kids[i] is the child for self.keys[i].
+                             This is the kind for nodes with few children, which are most of the nodes.
+                (2) Dense : self.keys is None, self.kids[i] is the child for the character with code point self.base + i (None if there is no such child).
+                            A node switches to it once it has more than DENSE_CHILDREN children which are close together, such as most of the alphabet.
+            Any character can be a key. The index of a character is its code point + 1, index 0 is the terminal node (self.end),
+            so that comparing indexes is the same as comparing characters, with the end of the word first.
 
         :Input:
             data : The payload of node.  
@@ -14,12 +44,25 @@ class Node:
                    The default value being initialised is [None,0]
             
         :args:
-            self.link : A list of 27 elements, each element is a pointer to another Node object.
+            self.keys : The sorted characters of the children of a sparse node, None for a dense node.
+            self.kids : The list of the children, it is created with the node so that a node is always allocated after its parent's list,
+                        which keeps the cyclic garbage collector from visiting each node twice.
+            self.base : The code point of self.kids[0] of a dense node.
+            self.end : The terminal node, which is the child at index 0.
             self.definition : The definition of the word.
             self.frequency : The frequency of the word.
             self.next_word_highest_freq_index : The index of the next character in the word with the highest frequency.
             self.current_max_frequency : While traversing along the word, this variable stores the current maximum frequency of the word prior reaching the terminal node.
             self.unique_freq : The number of unique words that starts with the same prefix.
+            self.top_words : The sorted list of the most frequent words that starts with the same prefix, None unless the Trie keeps top_k lists.
+            self.word : The word of a terminal node, None for other nodes.
+            self.best_terminal : The terminal node of the word with the highest frequency that starts with the same prefix.
+                                 It is the terminal node found by following next_word_highest_freq_index, a terminal node refers to itself.
+            self.cached : A boolean value to indicate whether the prefix which reaches this node is in the result cache of the Trie.
+            self.ranking : A sorted list of (-frequency, index) for each child, frequency is the frequency of the terminal node (index 0) or
+                           current_max_frequency of the child. It is only built when a word below the node is updated or deleted.
+            self.frequencies : A sorted list of (frequency, word, terminal node) for each word that starts with the prefix,
+                               only kept when the Trie is built with frequency_order=True, None otherwise.
 
         :Output, return or postcondition:
             None
@@ -28,15 +71,229 @@ class Node:
 
         :Aux space complexity: O(1) No extra memory is used here
         """
-        self.link = [None]*27
+        self.keys = ""
+        self.kids = []
+        self.base = 0
+        self.end = None
         self.definition = data[0]
         self.frequency = data[1]
         self.next_word_highest_freq_index = 0
         self.current_max_frequency = -1
         self.unique_freq = 0
+        self.top_words = None
+        self.word = None
+        self.best_terminal = None
+        self.cached = False
+        self.ranking = None
+        self.frequencies = None
+
+    def child(self, char:str) -> 'Node':
+        """
+        Function description:
+            child function is used to find the child of the node for a character.
+
+        :Input:
+            char : The character.
+
+        :Output, return or postcondition:
+            The child, None if there is no child for the character.
+
+        :Time complexity: O(C) for a sparse node, C is the number of children (at most DENSE_CHILDREN unless the children are far apart), O(1) for a dense node
+
+        :Aux space complexity: O(1)
+        """
+        if self.keys is not None:
+            position = self.keys.find(char)
+            if position < 0:
+                return None
+            return self.kids[position]
+        position = ord(char) - self.base
+        if 0 <= position < len(self.kids):
+            return self.kids[position]
+        return None
+
+    def child_at(self, index:int) -> 'Node':
+        """
+        Function description:
+            child_at function is used to find the child of the node at an index, index 0 is the terminal node.
+
+        :Time complexity: Same as child
+
+        :Aux space complexity: O(1)
+        """
+        if index == 0:
+            return self.end
+        return self.child(chr(index - 1))
+
+    def add_child(self, char:str, node:'Node') -> None:
+        """
+        Function description:
+            add_child function is used to set the child of the node for a character.
+
+        Approach description (if main function):
+            For a sparse node, the character is inserted into self.keys with binary search, and the node switches to dense once
+            it has more than DENSE_CHILDREN children spread over at most twice as many code points.
+            For a dense node, the table is grown to cover the character, and the node switches back to sparse if
+            the table would be more than twice as long as the number of children.
+
+        :Input:
+            char : The character.
+            node : The child.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(C), C is the number of children, the keys are copied on insertion
+
+        :Aux space complexity: O(C)
+        """
+        if not self.kids:
+            self.keys = char
+            self.kids.append(node)
+            return
+        if self.keys is not None:
+            position = bisect.bisect_left(self.keys,char)
+            if position < len(self.keys) and self.keys[position] == char:
+                self.kids[position] = node
+                return
+            self.keys = self.keys[:position] + char + self.keys[position:]
+            self.kids.insert(position,node)
+            if len(self.kids) > DENSE_CHILDREN and ord(self.keys[-1]) - ord(self.keys[0]) < 2*len(self.kids):
+                self.densify()
+            return
+        position = ord(char) - self.base
+        if position < 0:
+            self.kids[0:0] = [None]*(-position)
+            self.base += position
+            position = 0
+        elif position >= len(self.kids):
+            self.kids.extend([None]*(position - len(self.kids) + 1))
+        self.kids[position] = node
+        if len(self.kids) > 2*(len(self.kids) - self.kids.count(None)):
+            self.sparsify()
+
+    def remove_child(self, char:str) -> None:
+        """
+        Function description:
+            remove_child function is used to remove the child of the node for a character,
+            a dense node switches back to sparse once it has fewer than DENSE_CHILDREN // 2 children.
+
+        :Input:
+            char : The character.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(C), C is the number of children
+
+        :Aux space complexity: O(C)
+        """
+        if self.keys is not None:
+            position = self.keys.find(char)
+            if position >= 0:
+                self.keys = self.keys[:position] + self.keys[position+1:]
+                del self.kids[position]
+            return
+        position = ord(char) - self.base
+        if 0 <= position < len(self.kids):
+            self.kids[position] = None
+        if len(self.kids) - self.kids.count(None) < DENSE_CHILDREN // 2:
+            self.sparsify()
+
+    def densify(self) -> None:
+        """
+        Function description:
+            densify function is used to switch a sparse node to a dense node.
+
+        :Time complexity: O(C), C is the number of children
+
+        :Aux space complexity: O(C)
+        """
+        kids = [None]*(ord(self.keys[-1]) - ord(self.keys[0]) + 1)
+        self.base = ord(self.keys[0])
+        for position in range(len(self.keys)):
+            kids[ord(self.keys[position]) - self.base] = self.kids[position]
+        self.keys = None
+        self.kids[:] = kids
+
+    def sparsify(self) -> None:
+        """
+        Function description:
+            sparsify function is used to switch a dense node to a sparse node.
+
+        :Time complexity: O(S), S is the length of the dense table
+
+        :Aux space complexity: O(C), C is the number of children
+        """
+        keys = []
+        kids = []
+        for position in range(len(self.kids)):
+            if self.kids[position] is not None:
+                keys.append(chr(self.base + position))
+                kids.append(self.kids[position])
+        self.keys = "".join(keys)
+        self.kids[:] = kids
+        self.base = 0
+
+    def children(self) -> list[tuple[int,'Node']]:
+        """
+        Function description:
+            children function is used to list the children of the node with their index, in increasing order of index,
+            so the terminal node (index 0) comes first.
+
+        :Output, return or postcondition:
+            A list of tuples (index, child).
+
+        :Time complexity: O(C) for a sparse node, O(S) for a dense node, S is the length of the dense table
+
+        :Aux space complexity: O(C), C is the number of children
+        """
+        found = [] if self.end is None else [(0,self.end)]
+        if not self.kids:
+            return found
+        if self.keys is not None:
+            for position in range(len(self.keys)):
+                found.append((ord(self.keys[position]) + 1,self.kids[position]))
+        else:
+            for position in range(len(self.kids)):
+                if self.kids[position] is not None:
+                    found.append((self.base + position + 1,self.kids[position]))
+        return found
+
+    def copy(self) -> 'Node':
+        """
+        Function description:
+            copy function is used to create a copy of the node which can be changed without changing the node,
+            the children are shared but the lists of the node (kids, top_words and ranking) are copied.
+            The frequencies list is shared, not copied, since it holds an entry for every word below the node,
+            copy is only used by VersionedTrie, which does not keep the frequencies lists.
+
+        :Output, return or postcondition:
+            The copy of the node.
+
+        :Time complexity: O(C + k), C is the number of children, k as the length of top_words
+
+        :Aux space complexity: O(C + k)
+        """
+        node = Node([self.definition,self.frequency])
+        node.keys = self.keys
+        node.kids[:] = self.kids
+        node.base = self.base
+        node.end = self.end
+        node.next_word_highest_freq_index = self.next_word_highest_freq_index
+        node.current_max_frequency = self.current_max_frequency
+        node.unique_freq = self.unique_freq
+        node.top_words = None if self.top_words is None else list(self.top_words)
+        node.word = self.word
+        node.best_terminal = self.best_terminal
+        node.cached = self.cached
+        node.ranking = None if self.ranking is None else list(self.ranking)
+        node.frequencies = self.frequencies
+        return node
 
 class Trie:        
-    def __init__(self, dictionary:list[tuple[str,str,int]]) -> None:
+    def __init__(self, dictionary:list[tuple[str,str,int]], top_k:int = 0, cache_size:int = 0, definitions:'DefinitionStore' = None,
+                 frequency_order:bool = False) -> None:
         """
         Function description:
             init function is used to initialise a Trie. 
@@ -44,20 +301,228 @@ class Trie:
         :Input:
             dictionary : A list of tuples, each tuple consists of 3 elements, 1st element is the word, 2nd element is the definition of the word, 
                          3rd element is the frequency of the word.
+            top_k : The number of most frequent words kept at each node for prefix_search_topk, 0 (default) keeps none.
+            cache_size : The number of prefix_search results kept in the least recently used cache, 0 (default) disables the cache.
+            definitions : A DefinitionStore, if given, the definition of each word is a reference from DefinitionStore.pack
+                          which is only read from the store when the word is returned (Details at resolve). None (default) keeps the definitions.
+            frequency_order : A boolean value to indicate whether each node keeps the frequencies of the words below it in sorted order
+                              for count_at_least and best_in_range, False (default) keeps none.
             
         :args:
             self.root : A Node object which is the root of the Trie.
+            self.top_k : The number of most frequent words kept at each node.
+            self.cache_size : The number of prefix_search results kept in the cache.
+            self.cache : An OrderedDict from a prefix to its result and the node it reaches, from least to most recently used.
+            self.cache_hits, self.cache_misses, self.cache_evictions : The counters of the cache.
+            self.definitions : The DefinitionStore of the definitions, None if the definitions are kept in the nodes.
+            self.frequency_order : Whether the frequencies lists of the nodes are kept.
 
         :Output, return or postcondition:
             A for loop is used to iterate through the dictionary, and insert each word into the Trie accordingly.
+            The cyclic garbage collector is paused during the loop, the same as from_sorted.
+            If frequency_order is True, the frequencies lists are built once all words are inserted (Details at frequency_build).
 
         :Time complexity: O(T), T is the total number of characters in the dictionary, each word's character is visited once
 
         :Aux space complexity: O(T), T is the total number of characters in the dictionary
         """
         self.root = Node()
+        self.top_k = top_k
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.definitions = definitions
+        self.frequency_order = False
+        if dictionary:
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                for data in dictionary:
+                    self.insert(data[0],data)
+            finally:
+                if collecting:
+                    gc.enable()
+        if frequency_order:
+            self.frequency_build()
+
+    @classmethod
+    def from_sorted(cls, dictionary:list[tuple[str,str,int]], top_k:int = 0, cache_size:int = 0, processes:int = 0,
+                    frequency_order:bool = False) -> 'Trie':
+        """
+        Function description:
+            from_sorted function is used to build a Trie from a dictionary sorted by word in one pass, the result is the same as Trie(dictionary).
+
+        Approach description (if main function):
+            (i)  Check that the words are sorted and unique, raise ValueError otherwise.
+
+            (ii) The cyclic garbage collector is paused while the nodes are created, since none of them can be garbage and
+                 a collection would otherwise scan every node built so far again and again.
+                 If processes > 1, the words are grouped by their first character and each group is built into a subtrie with subtrie_build
+                 in a process pool, then the subtries are folded under a new root in index order.
+                 Else, the whole dictionary is built by build_sorted in this process.
+
+            (iii) The root is closed with close_node, and the frequencies lists are built with frequency_build if frequency_order is True.
+
+        :Input:
+            dictionary : A list of tuples (word, definition, frequency), sorted by word with no repeated word.
+            top_k : Same as Trie.
+            cache_size : Same as Trie.
+            processes : The number of processes used to build the subtries, 0 or 1 builds in this process.
+            frequency_order : Same as Trie.
+
+        :Output, return or postcondition:
+            A Trie with the words in the dictionary.
+
+        :Time complexity: O(T), T is the total number of characters in the dictionary, each node is created, folded and closed once
+                          O(T * k log k) when top_k lists are kept, k as top_k
+
+        :Aux space complexity: O(T)
+        """
+        #(i)
+        for position in range(1,len(dictionary)):
+            if dictionary[position-1][0] >= dictionary[position][0]:
+                raise ValueError("dictionary is not sorted by word or has a repeated word")
+
+        trie = cls([],top_k,cache_size)
+
+        #(ii)
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            if processes > 1:
+                groups = {}
+                for data in dictionary:
+                    if data[0] == "":
+                        trie.root.end = trie.terminal(data[0],data)
+                        trie.fold(trie.root,0)
+                    else:
+                        groups.setdefault(data[0][0],[]).append(data)
+                with ProcessPoolExecutor(processes) as pool:
+                    subtries = pool.map(subtrie_build,groups.values(),[top_k]*len(groups))
+                    for char,subtrie in zip(groups,subtries):
+                        trie.root.add_child(char,subtrie.child(char))
+                        trie.fold(trie.root,ord(char) + 1)
+            else:
+                trie.build_sorted(dictionary)
+        finally:
+            if collecting:
+                gc.enable()
+
+        #(iii)
+        trie.close_node(trie.root)
+        if frequency_order:
+            trie.frequency_build()
+        return trie
+
+    def build_sorted(self, dictionary:list[tuple[str,str,int]]) -> None:
+        """
+        Function description:
+            build_sorted function is used to create the nodes of a sorted dictionary under self.root in one pass.
+
+        Approach description (if main function):
+            stack[i] is the node reached by the first i characters of the previous word.
+            For each word, the nodes deeper than the common prefix with the previous word will never get another word below them,
+            thus, they are popped, closed with close_node and folded into their parent with fold.
+            Since the words are sorted, the children of a node are always folded in index order, the terminal node first.
+            Then a node is created for each of the remaining characters and the terminal node is linked to the last one and folded into it.
+            Once every word is added, all nodes left on the stack except the root are closed and folded.
+
+        :Input:
+            dictionary : A list of tuples (word, definition, frequency), sorted by word with no repeated word.
+
+        :Output, return or postcondition:
+            None, self.root is left for the caller to close.
+
+        :Time complexity: O(T), T is the total number of characters in the dictionary
+
+        :Aux space complexity: O(T)
+        """
+        stack = [self.root]
+        previous = ""
         for data in dictionary:
-            self.insert(data[0],data)
+            key = data[0]
+            common = 0
+            limit = min(len(previous),len(key))
+            while common < limit and previous[common] == key[common]:
+                common += 1
+            depth = len(stack) - 1
+            while depth > common:
+                self.close_node(stack.pop())
+                depth -= 1
+                self.fold(stack[depth],ord(previous[depth]) + 1)
+            current = stack[depth]
+            for char in key[common:]:
+                child = Node()
+                current.add_child(char,child)
+                stack.append(child)
+                current = child
+            current.end = self.terminal(key,data)
+            self.fold(current,0)
+            previous = key
+        depth = len(stack) - 1
+        while depth > 0:
+            self.close_node(stack.pop())
+            depth -= 1
+            self.fold(stack[depth],ord(previous[depth]) + 1)
+
+    def fold(self, curr:Node, index:int) -> None:
+        """
+        Function description:
+            fold function is used to add the information of the closed child at index to curr.
+            When the children of a node are folded in index order, the result is the same as calling info_update once for every word below
+            the node, since a child only replaces the best one when its frequency is strictly higher.
+
+        :Input:
+            curr : The parent node.
+            index : The index of the child, 0 for the terminal node.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1), or O(k) when top_k lists are kept, k as self.top_k
+
+        :Aux space complexity: O(1), or O(k) when top_k lists are kept
+        """
+        child = curr.child_at(index)
+        if index == 0:
+            frequency = child.frequency
+            curr.unique_freq += 1
+            entries = [(-child.frequency,child.word,child.definition)]
+        else:
+            frequency = child.current_max_frequency
+            curr.unique_freq += child.unique_freq
+            entries = child.top_words
+        if frequency > curr.current_max_frequency:
+            curr.current_max_frequency = frequency
+            curr.next_word_highest_freq_index = index
+        if self.top_k:
+            if curr.top_words is None:
+                curr.top_words = []
+            curr.top_words.extend(entries)
+
+    def close_node(self, curr:Node) -> None:
+        """
+        Function description:
+            close_node function is used to finish a node once all of its children are folded,
+            best_terminal is taken from the best child and top_words is sorted and cut down to self.top_k entries.
+
+        :Input:
+            curr : The node to be closed.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1), or O(C * k log k) when top_k lists are kept, k as self.top_k, C is the number of children of the node
+
+        :Aux space complexity: O(1)
+        """
+        if curr.unique_freq:
+            curr.best_terminal = curr.child_at(curr.next_word_highest_freq_index).best_terminal
+        if curr.top_words:
+            curr.top_words.sort()
+            del curr.top_words[self.top_k:]
 
     def info_update(self,curr:Node,index:int,frequency:int) -> None:
         """
@@ -92,25 +557,94 @@ class Trie:
             curr.next_word_highest_freq_index = index
         curr.unique_freq += 1
 
+    def resolve(self, definition):
+        """
+        Function description:
+            resolve function is used to turn the definition kept in a node into the definition returned,
+            every search reads the definition of the words returned through it.
+
+        :Input:
+            definition : The definition kept in a node.
+
+        :Output, return or postcondition:
+            The definition read from self.definitions if the Trie has a DefinitionStore, else the definition given.
+
+        :Time complexity: O(D), D is the length of the definition read, O(1) if the definitions are kept in the nodes
+
+        :Aux space complexity: O(D)
+        """
+        if self.definitions is None:
+            return definition
+        return self.definitions.get(definition)
+
+    def begin_write(self, key:str) -> Node:
+        """
+        Function description:
+            begin_write function is called by insert, update_frequency and delete before a word is changed,
+            it returns the root which the change is made on. For a Trie the nodes are changed in place, thus, it is self.root.
+
+        :Input:
+            key : The word to be changed.
+
+        :Output, return or postcondition:
+            The root to be changed.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        return self.root
+
+    def commit_write(self, root:Node) -> None:
+        """
+        Function description:
+            commit_write function is called once a change made on the root from begin_write is done.
+            For a Trie the change is already in place, thus, nothing is done.
+
+        :Input:
+            root : The root returned by begin_write.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        return
+
     def insert(self, key:str, data:list[str,str,int]=None) -> None:
         """
         Function description:
             insert function is used to insert words into the Trie character by character.
             
         Approach description (if main function):
-           (i)  Initialise variable current with the value of self.root.
+           (i)  Initialise variable current with the root returned by begin_write, which is self.root for a Trie.
            
            (ii) Iterate through each character in the word, and insert the character into the Trie accordingly.
-                (i) If current.link[index] is not None, which indicates there is already words which consits of the same prefix,
+                (i) If current.child(char) is not None, which indicates there is already words which consits of the same prefix,
                     thus, we update the information of the current node and set current to link to next node.
-                (ii) If current.link[index] is None, which indicates there is no words which consits of the same prefix,
+                (ii) If current.child(char) is None, which indicates there is no words which consits of the same prefix,
                     thus, we create a new node and set current to link to next node.
                     
             (iii) Once we arrive at the terminal node, loop terminates and we start to check whether the current node has a link to the terminal node.
-                (i) If current.link[index] is not None, which indicates there is already a word which consits of the same prefix,
+                (i) If current.end is not None, which indicates there is already a word which consits of the same prefix,
                     thus, we update the information of the current node. 
-                (ii) If current.link[index] is None, which indicates there is no word which consits of the same prefix,
+                (ii) If current.end is None, which indicates there is no word which consits of the same prefix,
                      thus, we create a new node and set current to link to next node.
+                If the terminal node is replaced and frequency_order is kept, its entry is replaced in the frequencies lists of the nodes visited.
+
+            (iv) If top_k lists are kept and the terminal node has been created or replaced, the new entry is put into the list of each node visited.
+                 A word inserted again whose terminal node is kept leaves the lists unchanged, thus, the lists always agree with the terminal nodes.
+
+            (v) Walk back up the nodes visited, from the terminal node to the root, setting best_terminal of each node to best_terminal of
+                the child at next_word_highest_freq_index. It is done bottom up since a word which does not change next_word_highest_freq_index
+                of a node can still become the best word below that child.
+                The ranking of each node visited is dropped, it is built again by the next update_frequency or delete which needs it.
+
+            (vi) The root is published with commit_write.
+                 If the cache is not empty, the cached results of the prefixes of the word are no longer valid since unique_freq of every node
+                 visited has changed, thus, they are removed with cache_invalidate.
             
         :Input:
             argv1 : key : The word to be inserted into the Trie character by character.
@@ -124,6 +658,7 @@ class Trie:
            None
 
         :Time complexity: O(length), length is the length of the word as the loop iterates through each letter in the word
+                          O(length * k) when top_k lists are kept, k as self.top_k (Details at top_update)
 
         :Aux space complexity: 
             Best Case : O(definiton), definition as the number of letters of the definition of the word.
@@ -133,256 +668,2345 @@ class Trie:
                          When the prefix of the word is new to to Trie, we will need to create a node for each letter 
         """
         #(i)
-        current = self.root
+        current = self.begin_write(key)
+        path = []
         
         #(ii)
         for char in key:
-            index = ord(char) - 97 + 1
-            if current.link[index] is not None:
+            index = ord(char) + 1
+            path.append(current)
+            child = current.child(char)
+            if child is not None:
                 self.info_update(current,index,data[2])
-                current = current.link[index]
+                current = child
             else:
-                current.link[index]=Node()
+                child = Node()
+                current.add_child(char,child)
                 self.info_update(current,index,data[2])
-                current = current.link[index]
+                current = child
         #(iii)        
         index = 0
-        if current.link[index] is None:
-            current.link[index] = Node([data[1],data[2]])
+        path.append(current)
+        previous = current.end
+        if current.end is None:
+            current.end = self.terminal(key,data)
             self.info_update(current,index,data[2])
         else:
             self.info_update(current,index,data[2])
             if current.current_max_frequency <= data[2]:
-                current.link[index] = Node([data[1],data[2]])
-
-    def prefix_search(self,prefix : str) -> list[str,str,int]:
-        """
-        Function description:
-            prefix_search function is used to search for the word with the prefix given which has the highest frequency in the Trie 
-            
-        Approach description (if main function):
-            (i) Initialse variable final_word with the value of prefix (Final word must starts with the prefix given)
-                Initialise variable current with the value of self.root.
-                Time Complexity: O(1) Initialisation only
-                Aux Space Complexity: O(1) No extra memory is used here
-                
-            (ii) For loop is then used to iterate through each character in the prefix which below 2 conditions
-                (i) If current.link[index] is None, which indicates there is no words which consits of the prefix given,
-                    thus, we return [None,None,0]
-                (ii) Else, we set current to link to next node.
-                This help us to set up to further action of searching for the word with the prefix given which has the highest frequency in the Trie.
-                Time Complexity: O(M), M is the length of the prefix
-                Aux Space Complexity: O(M) No extra memory is used here
-            
-            (iii) Initialise variable final_unique_frequency with the value of current.unique_freq (The number of unique words that starts with the prefix given)
-                  While loop is then used to search for the word with the prefix given which has the highest frequency in the Trie.
-                  While current.definition is None (Only terminal node has definition), if current.next_word_highest_freq_index > 0, 
-                  which indicates there is still an alphabet in the word with the highest frequency, we append the alphabet to final_word.
-                  Then we set current to link to next node.
-                  Loop terminates once we arrive at the terminal node and the word with the highest frequency is found along with its definition.
-                  Return our final answer which is a list of 3 elements with the word with the highest frequency, its definition and the number of unique words that starts with the prefix given.
-                  Time Complexity: O(N), N is the number of characters in the word with the highest frequency
-                  Space Complexity: O(N), N is the number of characters in the word with the highest frequency
-                 
-        :Input:
-            argv1 : prefix : The prefix of the word to be searched.
-            
-        :args:
-            None
-
-        :Output, return or postcondition:
-            A list which consists of 3 elements, 
-            1st element is the word with the highest frequency among the words which starts with the prefix given
-            (If there are >= 1 words with the same highest frequency, the words which is lexigraphically smaller will be chosen) 
-            2nd element is the definition of the word, 
-            3rd element is the number of unique words that starts with the prefix given.
-            
-        :Time complexity: O(M) + O(N) = O(M+N)
-
-        :Aux space complexity: O(M) + O(N) = O(M+N)
-        """
-        
-        #(i)
-        final_word = prefix
-        current = self.root
-        
-        #(ii)
-        for char in prefix:
-            index = ord(char) - 97 + 1
-            if current.link[index] is None:
-                return [None,None,0]
-            current = current.link[index]
-         
-         #(iii)       
-        final_unique_frequency = current.unique_freq
-        
-        while current.definition is None:
-            if current.next_word_highest_freq_index > 0:
-                final_word += chr(current.next_word_highest_freq_index+96) 
-            current = current.link[current.next_word_highest_freq_index]
+                current.end = self.terminal(key,data)
+        if self.frequency_order and current.end is not previous:
+            self.frequency_replace(path,previous,current.end)
 
-        return [final_word,current.definition,final_unique_frequency]
-    
-### DO NOT CHANGE THIS FUNCTION
-def load_dictionary(filename):
-    infile = open(filename)
-    word, frequency = "", 0
-    aList = []
-    for line in infile:
-        line.strip()
-        if line[0:4] == "word":
-            line = line.replace("word: ","")
-            line = line.strip()
-            word = line            
-        elif line[0:4] == "freq":
-            line = line.replace("frequency: ","")
-            frequency = int(line)
-        elif line[0:4] == "defi":
-            index = len(aList)
-            line = line.replace("definition: ","")
-            definition = line.replace("\n","")
-            aList.append([word,definition,frequency])
+        #(iv)
+        if self.top_k and current.end is not previous:
+            entry = (-data[2],key,data[1])
+            for node in path:
+                self.top_update(node,entry)
 
-    return aList
+        #(v)
+        for current in reversed(path):
+            current.best_terminal = current.child_at(current.next_word_highest_freq_index).best_terminal
+            current.ranking = None
 
-#Question 2
-from collections import deque
+        #(vi)
+        self.commit_write(path[0])
+        if self.cache:
+            self.cache_invalidate(key,path)
 
-class Vertex:
-    def __init__(self,id:int) -> None:
+    def cache_invalidate(self, key:str, path:list[Node]) -> None:
         """
         Function description:
-            init function is used to initialize the vertex object which represents each vertex in the graph
+            cache_invalidate function is used to remove the cached results of the prefixes of key, path[i] is the node reached by key[:i].
+            Only the nodes which are marked as cached have a prefix to be removed, thus, no prefix string is built for the other nodes.
 
         :Input:
-            id: the id of vertex ( Used to differentiate each vertex )
-            
-        :Instances:
-            self.id: the id of vertex ( Used to differentiate each vertex )
-            self.edges: the list of edges that are connected to the vertex
-            self.discovered: a boolean value to indicate whether the vertex has been discovered or not
-            self.visited: a boolean value to indicate whether the vertex has been visited or not
-            self.previous: the previous edge that is used to reach this vertex
+            key : The word which has been changed.
+            path : The list of nodes reached by each prefix of key.
 
         :Output, return or postcondition:
             None
 
-        :Time complexity: O(1) Initialisation 
+        :Time complexity: O(length + C * length), length is the length of the key, C is the number of cached prefixes of the key
 
-        :Aux space complexity: O(1) No extra memory is used here
+        :Aux space complexity: O(length), for the prefix being removed
         """
-        self.id = id
-        self.edges = []
-        self.discovered = False
-        self.visited = False
-        self.previous = None
+        for depth in range(len(path)):
+            if path[depth].cached:
+                path[depth].cached = False
+                del self.cache[key[:depth]]
 
-class Edge:
-    def __init__(self, u:int, v:int, f:int = 0, c:int = 0) -> None:
+    def cache_info(self) -> dict[str,int]:
         """
         Function description:
-            init function is used to initialize the edge object which represents each edge in the graph
+            cache_info function is used to report the counters of the prefix_search result cache.
 
-        :Input:
-            u: the vertex which is the departure point of the edge
-            v: the vertex which is the arrival point of the edge
-            f: the flow of the edge
-            c: the capacity of the edge
-            
-        :Instances:
-            self.depart: the vertex which is the departure point of the edge
-            self.arrive: the vertex which is the arrival point of the edge
-            self.flow : the flow of the edge
-            self.capacity: the capacity (Maximum flow which can pass through) of the edge
-            self.origin : One way edge (depart -> arrive) which created at FlowGraph
-            self.front : One of the two-way edge (depart -> arrive) which created at residualNetwork
-            self.behind : One of the two-way edge (arrive -> depart) which created at residualNetwork
+        :Output, return or postcondition:
+            A dictionary with the number of hits, misses, evictions, the number of results cached and the maximum size of the cache.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        return {"hits":self.cache_hits,"misses":self.cache_misses,"evictions":self.cache_evictions,"size":len(self.cache),"max_size":self.cache_size}
+
+    def stats(self) -> dict:
+        """
+        Function description:
+            stats function is used to report the size of the Trie, and the work counters if count_work is enabled.
+
+        Approach description (if main function):
+            (i)  Walk every node from the root with a stack, counting the non terminal nodes by depth and the terminal nodes.
+
+            (ii) The bytes are estimated with sys.getsizeof by component:
+                 nodes : the node objects themselves, with all their fields (terminal nodes included).
+                 children : the kids lists, and the keys strings longer than one character (one character strings are shared by Python).
+                 definitions : the definitions kept in the terminal nodes (int references if the Trie has a DefinitionStore).
+                 words : the word of each terminal node.
+                 aggregates : the top_words and ranking lists with their entries.
+
+            The string_bytes counter of work only covers the definitions decoded from a DefinitionStore by resolve,
+            thus, it is always 0 for a Trie which keeps its definitions in memory.
+
+        :Output, return or postcondition:
+            A dictionary with the number of nodes, the number of terminals, depth_histogram (depth_histogram[i] is the number of
+            non terminal nodes reached by a prefix of length i), bytes (a dictionary by component and the total),
+            and work (the counters of count_work, None if it is not enabled).
+
+        :Time complexity: O(N + k * N), N is the number of nodes, k as self.top_k
+
+        :Aux space complexity: O(N) for the stack in the worst case
+        """
+        #(i)
+        histogram = []
+        nodes = 0
+        terminals = 0
+        size = {"nodes":0,"children":0,"definitions":0,"words":0,"aggregates":0}
+        stack = [(self.root,0)]
+        while stack:
+            current,depth = stack.pop()
+            nodes += 1
+            if depth == len(histogram):
+                histogram.append(0)
+            histogram[depth] += 1
+
+            #(ii)
+            size["nodes"] += sys.getsizeof(current)
+            size["children"] += sys.getsizeof(current.kids)
+            if current.keys is not None and len(current.keys) > 1:
+                size["children"] += sys.getsizeof(current.keys)
+            for entries in (current.top_words,current.ranking):
+                if entries is not None:
+                    size["aggregates"] += sys.getsizeof(entries) + sum(sys.getsizeof(entry) for entry in entries)
+            for index,child in current.children():
+                if index == 0:
+                    terminals += 1
+                    size["nodes"] += sys.getsizeof(child)
+                    size["definitions"] += sys.getsizeof(child.definition)
+                    size["words"] += sys.getsizeof(child.word)
+                else:
+                    stack.append((child,depth + 1))
+
+        size["total"] = sum(size.values())
+        return {"nodes":nodes,"terminals":terminals,"depth_histogram":histogram,"bytes":size,"work":getattr(self,"work",None)}
+
+    def count_work(self, enabled:bool = True) -> None:
+        """
+        Function description:
+            count_work function is used to turn the work counters of insert and prefix_search on or off.
+
+        Approach description (if main function):
+            The counters are kept by wrappers which are set as attributes of this Trie only, they shadow the methods of the class,
+            thus, a Trie which does not count runs the methods directly and pays nothing.
+            (i)  insert is counted as visiting the root and one node for each character of the word, the same as its loop.
+            (ii) prefix_search is counted by walking the prefix in the wrapper itself, counting the root and each node reached,
+                 then the result is built by search_result, thus, the prefix is walked once. A cached prefix is answered by prefix_search
+                 and visits no node.
+            (iii) info_update calls are counted, and so are the bytes of the strings built by resolve (the definitions read from a DefinitionStore),
+                  no other string is built by a search.
+
+        :Input:
+            enabled : A boolean value to indicate whether the counters are turned on (True, default) or off.
+                      Turning them on again resets them to 0.
+
+        :Output, return or postcondition:
+            None, self.work is the dictionary of counters while enabled: inserts, prefix_searches, nodes_visited, info_updates, string_bytes.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        for name in ("insert","prefix_search","info_update","resolve","work"):
+            self.__dict__.pop(name,None)
+        if not enabled:
+            return
+        work = {"inserts":0,"prefix_searches":0,"nodes_visited":0,"info_updates":0,"string_bytes":0}
+        self.work = work
+        insert = self.insert
+        prefix_search = self.prefix_search
+        info_update = self.info_update
+        resolve = self.resolve
+
+        #(i)
+        def counted_insert(key,data=None):
+            work["inserts"] += 1
+            work["nodes_visited"] += len(key) + 1
+            insert(key,data)
+
+        #(ii)
+        def counted_prefix_search(prefix):
+            work["prefix_searches"] += 1
+            if self.cache_size:
+                if prefix in self.cache:
+                    return prefix_search(prefix)
+                self.cache_misses += 1
+            current = self.root
+            work["nodes_visited"] += 1
+            for char in prefix:
+                current = current.child(char)
+                if current is None:
+                    return [None,None,0]
+                work["nodes_visited"] += 1
+            return self.search_result(prefix,current)
+
+        #(iii)
+        def counted_info_update(curr,index,frequency):
+            work["info_updates"] += 1
+            info_update(curr,index,frequency)
+
+        def counted_resolve(definition):
+            result = resolve(definition)
+            if self.definitions is not None:
+                work["string_bytes"] += len(result.encode("utf-8"))
+            return result
+
+        self.insert = counted_insert
+        self.prefix_search = counted_prefix_search
+        self.info_update = counted_info_update
+        self.resolve = counted_resolve
+
+    def terminal(self, key:str, data:list[str,str,int]) -> Node:
+        """
+        Function description:
+            terminal function is used to create the terminal node of a word, which holds the definition, the frequency and the word itself.
+
+        :Input:
+            key : The word.
+            data : A list which consists of 3 elements, 1st element is the word, 2nd element is the definition of the word, 3rd element is the frequency of the word.
+
+        :Output, return or postcondition:
+            The terminal node, its best_terminal refers to itself.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        terminal = Node([data[1],data[2]])
+        terminal.word = key
+        terminal.best_terminal = terminal
+        return terminal
+
+    def update_frequency(self, key:str, frequency:int) -> None:
+        """
+        Function description:
+            update_frequency function is used to change the frequency of a word which is already in the Trie.
+
+        Approach description (if main function):
+            (i)  Find the nodes reached by each prefix of the word with find_path, raise KeyError if the word is not in the Trie.
+
+            (ii) Replace the terminal node with a new terminal node with the new frequency, also in the frequencies lists if they are kept.
+
+            (iii) Walk back up the nodes with rerank, so that the ranking, current_max_frequency, next_word_highest_freq_index and best_terminal
+                  of each node reflect the new frequency, even when the frequency goes down. The root is published with commit_write.
+
+        :Input:
+            key : The word to be updated.
+            frequency : The new frequency of the word.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(length * log C), length is the length of the word, C is the number of children of a node (Details at rerank)
+                          O(length * k log k) when top_k lists are kept, k as self.top_k
+
+        :Aux space complexity: O(length)
+        """
+        #(i)
+        path,previous = self.find_path(key)
+
+        #(ii)
+        terminal = path[-1].end
+        path[-1].end = self.terminal(key,[key,terminal.definition,frequency])
+        if self.frequency_order:
+            self.frequency_replace(path,terminal,path[-1].end)
+
+        #(iii)
+        self.rerank(key,path,previous,False)
+        self.commit_write(path[0])
+
+    def delete(self, key:str) -> None:
+        """
+        Function description:
+            delete function is used to remove a word from the Trie.
+
+        Approach description (if main function):
+            (i)  Find the nodes reached by each prefix of the word with find_path, raise KeyError if the word is not in the Trie.
+
+            (ii) Remove the terminal node of the word, also from the frequencies lists if they are kept.
+
+            (iii) Walk back up the nodes with rerank, unique_freq of each node is decremented by 1 and
+                  nodes which have no child left are removed from their parent. The root is published with commit_write.
+
+        :Input:
+            key : The word to be removed.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(length * log C), length is the length of the word, C is the number of children of a node (Details at rerank)
+                          O(length * k log k) when top_k lists are kept, k as self.top_k
+
+        :Aux space complexity: O(length)
+        """
+        #(i)
+        path,previous = self.find_path(key)
+
+        #(ii)
+        if self.frequency_order:
+            self.frequency_replace(path,path[-1].end,None)
+        path[-1].end = None
+
+        #(iii)
+        self.rerank(key,path,previous,True)
+        self.commit_write(path[0])
+
+    def find_path(self, key:str) -> tuple[list[Node],list[int]]:
+        """
+        Function description:
+            find_path function is used to find the nodes reached by each prefix of a word in the Trie, and to build their ranking if it is missing.
+            The nodes are found from the root returned by begin_write.
+
+        :Input:
+            key : The word to be found.
+
+        :Output, return or postcondition:
+            A tuple of 2 lists, path[i] is the node reached by key[:i], previous[i] is the frequency of the child of path[i] along the word
+            (the terminal node for the last node) before any change is made.
+            KeyError is raised if the word is not in the Trie.
+
+        :Time complexity: O(length), or O(length * C log C) when the ranking of the nodes has to be built, C is the number of children of a node
+
+        :Aux space complexity: O(length)
+        """
+        current = self.begin_write(key)
+        path = [current]
+        for char in key:
+            current = current.child(char)
+            if current is None:
+                raise KeyError(key)
+            path.append(current)
+        if current.end is None:
+            raise KeyError(key)
+        previous = [node.current_max_frequency for node in path[1:]]
+        previous.append(current.end.frequency)
+        for current in path:
+            if current.ranking is None:
+                current.ranking = sorted((-self.child_frequency(current,index),index) for index,child in current.children())
+        return path,previous
+
+    def child_frequency(self, curr:Node, index:int) -> int:
+        """
+        Function description:
+            child_frequency function is used to get the frequency which the child at index is ranked by,
+            the frequency of the word for the terminal node, or the highest frequency below the child for other nodes.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        if index == 0:
+            return curr.end.frequency
+        return curr.child_at(index).current_max_frequency
+
+    def rerank(self, key:str, path:list[Node], previous:list[int], removed:bool) -> None:
+        """
+        Function description:
+            rerank function is used to bring the nodes along a word up to date after its terminal node is replaced or removed.
+
+        Approach description (if main function):
+            Walk back up the path from the last node to the root. For each node:
+            (i)   The entry of the child along the word is found in the ranking with binary search using its previous frequency and removed.
+                  If the child is still there, it is inserted again with its new frequency.
+                  When a word is removed, a child with an empty ranking has no word left below it, thus, it is removed from the node instead.
+            (ii)  The first entry of the ranking gives current_max_frequency and next_word_highest_freq_index, which follows the same tie-breaking
+                  as info_update, and best_terminal is taken from that child.
+                  When a word is removed, unique_freq is decremented by 1 (0 if no child is left).
+            (iii) If top_k lists are kept, top_words is merged again from the top_words of the children and the terminal node.
+            Finally, the cached results of the prefixes of the word are removed with cache_invalidate.
+
+        :Input:
+            key : The word which is changed.
+            path : The nodes reached by each prefix of the word, from find_path.
+            previous : The previous frequency of the child of each node along the word, from find_path.
+            removed : A boolean value to indicate whether the word is removed or its frequency is updated.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(length * log C), length is the length of the word, C is the number of children of a node,
+                          a binary search and a shift of at most C entries per node
+                          O(length * k log k) when top_k lists are kept, k as self.top_k
+
+        :Aux space complexity: O(1), or O(k) when top_k lists are kept
+        """
+        for depth in range(len(path)-1,-1,-1):
+            current = path[depth]
+            ranking = current.ranking
+            if depth == len(path) - 1:
+                index = 0
+            else:
+                index = ord(key[depth]) + 1
+
+            #(i)
+            del ranking[bisect.bisect_left(ranking,(-previous[depth],index))]
+            child = current.child_at(index)
+            if child is not None and removed and index > 0 and not child.ranking:
+                current.remove_child(key[depth])
+                child = None
+            if child is not None:
+                bisect.insort(ranking,(-self.child_frequency(current,index),index))
+
+            #(ii)
+            if ranking:
+                current.current_max_frequency = -ranking[0][0]
+                current.next_word_highest_freq_index = ranking[0][1]
+                current.best_terminal = current.child_at(ranking[0][1]).best_terminal
+                if removed:
+                    current.unique_freq -= 1
+            else:
+                current.current_max_frequency = -1
+                current.next_word_highest_freq_index = 0
+                current.best_terminal = None
+                current.unique_freq = 0
+
+            #(iii)
+            if self.top_k:
+                entries = []
+                for frequency,child_index in ranking:
+                    child = current.child_at(child_index)
+                    if child_index == 0:
+                        entries.append((-child.frequency,child.word,child.definition))
+                    elif child.top_words is not None:
+                        entries.extend(child.top_words)
+                entries.sort()
+                current.top_words = entries[:self.top_k]
+
+        if self.cache:
+            self.cache_invalidate(key,path)
+
+    def top_update(self,curr:Node,entry:tuple[int,str,str]) -> None:
+        """
+        Function description:
+            top_update function is used to keep the top_k most frequent words which starts with the prefix of the current node.
+
+        Approach description (if main function):
+            curr.top_words is a list of at most self.top_k entries (-frequency, word, definition), sorted in ascending order,
+            which is the same as sorted by frequency in descending order, then by word lexicographically.
+            If the word is already in the list, its old entry is removed, insert only calls top_update when the terminal node of the word
+            is replaced, which never lowers its frequency, thus, no word which has been cut from the list can rank above the new entry.
+            The entry is inserted with binary search and the last entry is removed if the list grows above self.top_k.
+
+        :Input:
+            curr : The current node.
+            entry : A tuple (-frequency, word, definition) of the word being inserted.
+
+        :Output, return or postcondition:
+           None
+
+        :Time complexity: O(k), k as self.top_k, the list is scanned for the same word and shifted on insertion
+
+        :Aux space complexity: O(1), at most one entry is added to the list
+        """
+        if curr.top_words is None:
+            curr.top_words = []
+        top_words = curr.top_words
+        for position in range(len(top_words)):
+            if top_words[position][1] == entry[1]:
+                del top_words[position]
+                break
+        bisect.insort(top_words,entry)
+        if len(top_words) > self.top_k:
+            top_words.pop()
+
+    def frequency_build(self) -> None:
+        """
+        Function description:
+            frequency_build function is used to build the frequencies list of every node after a bulk build, and to turn frequency_order on.
+
+        Approach description (if main function):
+            The nodes are listed in breadth first order and visited in reverse, thus, the children of a node are done before it.
+            The list of a node is the entry of its terminal node and the lists of its children, sorted. The lists of the children are
+            already sorted, thus, the sort only merges them. The entry of a word is one tuple shared by the lists of all its prefixes.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(T log C), T is the total number of characters in the Trie, C is the number of children of a node
+
+        :Aux space complexity: O(T), each word has an entry in the list of each of its prefixes
+        """
+        order = [self.root]
+        for current in order:
+            order.extend(child for index,child in current.children() if index > 0)
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for current in reversed(order):
+                entries = []
+                for index,child in current.children():
+                    if index == 0:
+                        entries.append((child.frequency,child.word,child))
+                    else:
+                        entries.extend(child.frequencies)
+                entries.sort()
+                current.frequencies = entries
+        finally:
+            if collecting:
+                gc.enable()
+        self.frequency_order = True
+
+    def frequency_replace(self, path:list[Node], old:Node, new:Node) -> None:
+        """
+        Function description:
+            frequency_replace function is used to replace the entry of a terminal node in the frequencies lists of the nodes reached by the prefixes of its word.
+
+        :Input:
+            path : The nodes reached by each prefix of the word, from the root.
+            old : The terminal node which is replaced, None if the word is new.
+            new : The terminal node which replaces it, None if the word is removed.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(length * n), length is the length of the word, n is the number of words below a node, the list is shifted on insertion
+
+        :Aux space complexity: O(1)
+        """
+        if new is not None:
+            entry = (new.frequency,new.word,new)
+        for current in path:
+            if current.frequencies is None:
+                current.frequencies = []
+            if old is not None:
+                del current.frequencies[bisect.bisect_left(current.frequencies,(old.frequency,old.word))]
+            if new is not None:
+                bisect.insort(current.frequencies,entry)
+
+    def count_at_least(self, prefix:str, frequency:int) -> int:
+        """
+        Function description:
+            count_at_least function is used to count the words which start with the prefix given and have a frequency of at least frequency.
+
+        Approach description (if main function):
+            (i)  Raise ValueError if the frequencies lists are not kept.
+
+            (ii) Walk the prefix, return 0 if it is not in the Trie.
+
+            (iii) The frequencies list of the node is sorted, thus, a binary search for the first entry with a frequency >= frequency gives the count.
+
+        :Input:
+            argv1 : prefix : The prefix of the words to be counted.
+            argv2 : frequency : The lowest frequency counted.
+
+        :Output, return or postcondition:
+            The number of distinct words which start with the prefix and have a frequency >= frequency.
+
+        :Time complexity: O(M + log n), M is the length of the prefix, n is the number of words which start with the prefix
+
+        :Aux space complexity: O(1)
+        """
+        #(i)
+        if not self.frequency_order:
+            raise ValueError("the Trie is not built with frequency_order=True")
+
+        #(ii)
+        current = self.root
+        for char in prefix:
+            current = current.child(char)
+            if current is None:
+                return 0
+
+        #(iii)
+        return len(current.frequencies) - bisect.bisect_left(current.frequencies,frequency,key=lambda entry: entry[0])
+
+    def best_in_range(self, prefix:str, low:int, high:int) -> list[str,str,int]:
+        """
+        Function description:
+            best_in_range function is used to search for the word with the highest frequency in [low, high] among the words which start with the prefix given.
+
+        Approach description (if main function):
+            (i)  Raise ValueError if the frequencies lists are not kept.
+
+            (ii) Walk the prefix, return [None,None,0] if it is not in the Trie.
+
+            (iii) Binary search the sorted frequencies list of the node for the first entry with a frequency >= low and the last entry with a frequency <= high,
+                  the entries between them are the words in range. The last one has the highest frequency in range, and the entries with the same frequency
+                  are sorted by word, thus, a 3rd binary search gives the lexicographically smallest of them, the same tie-breaking as prefix_search.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+            argv2 : low : The lowest frequency in range.
+            argv3 : high : The highest frequency in range.
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, the word with the highest frequency in range, its definition and
+            the number of distinct words which start with the prefix and have a frequency in range, [None,None,0] if there is none.
+
+        :Time complexity: O(M + log n), M is the length of the prefix, n is the number of words which start with the prefix
+
+        :Aux space complexity: O(1)
+        """
+        #(i)
+        if not self.frequency_order:
+            raise ValueError("the Trie is not built with frequency_order=True")
+
+        #(ii)
+        current = self.root
+        for char in prefix:
+            current = current.child(char)
+            if current is None:
+                return [None,None,0]
+
+        #(iii)
+        entries = current.frequencies
+        first = bisect.bisect_left(entries,low,key=lambda entry: entry[0])
+        last = bisect.bisect_right(entries,high,key=lambda entry: entry[0]) - 1
+        if last < first:
+            return [None,None,0]
+        terminal = entries[bisect.bisect_left(entries,entries[last][0],first,last,key=lambda entry: entry[0])][2]
+        return [terminal.word,self.resolve(terminal.definition),last - first + 1]
+
+    def prefix_search(self,prefix : str) -> list[str,str,int]:
+        """
+        Function description:
+            prefix_search function is used to search for the word with the prefix given which has the highest frequency in the Trie 
+            
+        Approach description (if main function):
+            (i) If the cache is enabled and the prefix is cached, the cached result is moved to the most recently used end and a copy is returned.
+                Else, initialise variable current with the value of self.root.
+                Time Complexity: O(1) Initialisation only
+                Aux Space Complexity: O(1) No extra memory is used here
+                
+            (ii) For loop is then used to iterate through each character in the prefix which below 2 conditions
+                (i) If current.child(char) is None, which indicates there is no words which consits of the prefix given,
+                    thus, we return [None,None,0]
+                (ii) Else, we set current to link to next node.
+                This help us to set up to further action of searching for the word with the prefix given which has the highest frequency in the Trie.
+                Time Complexity: O(M), M is the length of the prefix
+                Aux Space Complexity: O(M) No extra memory is used here
+            
+            (iii) current.best_terminal is the terminal node of the word with the highest frequency that starts with the prefix given,
+                  which is kept up to date by insert, thus, no descent along next_word_highest_freq_index and no string building is needed.
+                  Return our final answer which is a list of 3 elements with the word with the highest frequency, its definition and the number of unique words that starts with the prefix given.
+                  ([None,None,0] if the Trie is empty)
+                  If the cache is enabled, the result is cached and the least recently used result is evicted once the cache is full.
+                  This step is done by search_result, which count_work shares.
+                  Time Complexity: O(1)
+                  Space Complexity: O(1)
+                 
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+            
+        :args:
+            None
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, 
+            1st element is the word with the highest frequency among the words which starts with the prefix given
+            (If there are >= 1 words with the same highest frequency, the words which is lexigraphically smaller will be chosen) 
+            2nd element is the definition of the word, 
+            3rd element is the number of unique words that starts with the prefix given.
+            
+        :Time complexity: O(M) + O(1) = O(M), O(1) expected for a cached prefix
+
+        :Aux space complexity: O(1)
+        """
+        
+        #(i)
+        if self.cache_size:
+            cached = self.cache.get(prefix)
+            if cached is not None:
+                self.cache.move_to_end(prefix)
+                self.cache_hits += 1
+                return list(cached[0])
+            self.cache_misses += 1
+
+        current = self.root
+        
+        #(ii)
+        for char in prefix:
+            current = current.child(char)
+            if current is None:
+                return [None,None,0]
+         
+         #(iii)       
+        return self.search_result(prefix,current)
+
+    def search_result(self, prefix:str, current:Node) -> list[str,str,int]:
+        """
+        Function description:
+            search_result function is used to build the answer of prefix_search once the prefix has been walked to the node current,
+            and to cache it if the cache is enabled.
+
+        :Input:
+            prefix : The prefix searched.
+            current : The node reached by the prefix.
+
+        :Output, return or postcondition:
+            The same list as prefix_search, the least recently used result is evicted once the cache is full.
+
+        :Time complexity: O(1), and the cost of resolve
+
+        :Aux space complexity: O(1)
+        """
+        terminal = current.best_terminal
+        if terminal is None:
+            return [None,None,0]
+
+        result = [terminal.word,self.resolve(terminal.definition),current.unique_freq]
+        if self.cache_size:
+            if len(self.cache) >= self.cache_size:
+                evicted = self.cache.popitem(last=False)[1]
+                evicted[1].cached = False
+                self.cache_evictions += 1
+            self.cache[prefix] = (result,current)
+            current.cached = True
+            result = list(result)
+        return result
+
+    def prefix_search_topk(self,prefix : str, k : int) -> list[list[str,str,int]]:
+        """
+        Function description:
+            prefix_search_topk function is used to search for the k words with the prefix given which have the highest frequency in the Trie
+
+        Approach description (if main function):
+            (i) If k is larger than self.top_k, the lists kept at each node are too short to answer, thus, ValueError is raised.
+
+            (ii) For loop is used to iterate through each character in the prefix, return [] if there is no words which consits of the prefix given.
+
+            (iii) The first k entries of current.top_words are already sorted by frequency, then lexicographically, thus, they are returned directly.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+            argv2 : k : The number of words to be returned, at most self.top_k.
+
+        :Output, return or postcondition:
+            A list of at most k lists, each list consists of 3 elements, the word, the definition of the word and the frequency of the word,
+            sorted by frequency in descending order, then by word lexicographically.
+
+        :Time complexity: O(M + k), M is the length of the prefix
+
+        :Aux space complexity: O(k)
+        """
+        #(i)
+        if k > self.top_k:
+            raise ValueError("k is larger than the top_k the Trie was built with")
+
+        #(ii)
+        current = self.root
+        for char in prefix:
+            current = current.child(char)
+            if current is None:
+                return []
+
+        #(iii)
+        if current.top_words is None:
+            return []
+        return [[word,self.resolve(definition),-frequency] for frequency,word,definition in current.top_words[:k]]
+
+    def prefix_search_many(self,prefixes : list[str]) -> list[list[str,str,int]]:
+        """
+        Function description:
+            prefix_search_many function is used to run prefix_search for many prefixes at once, sharing the work between prefixes with the same leading characters.
+
+        Approach description (if main function):
+            (i) Sort the positions of the prefixes by prefix, so that prefixes sharing leading characters are next to each other.
+                Initialise path with [self.root], path[i] is the node reached after the first i characters of the previous prefix.
+
+            (ii) For each prefix in sorted order, a prefix equal to the previous one reuses its answer.
+                 Else, only the characters after the common part with the previous prefix are walked, starting from the node kept in path.
+                 If a character cannot be found, the answer is [None,None,0].
+
+            (iii) Else, the answer is read from best_terminal of the node reached, the same as prefix_search.
+
+        :Input:
+            argv1 : prefixes : The list of prefixes to be searched.
+
+        :Output, return or postcondition:
+            A list with the answer of prefix_search for each prefix, in the same order as prefixes.
+
+        :Time complexity: O(P log P + S), P is the number of prefixes, S is the number of characters which are not shared with the previous prefix in sorted order
+
+        :Aux space complexity: O(P)
+        """
+        #(i)
+        order = sorted(range(len(prefixes)),key=prefixes.__getitem__)
+        results = [None]*len(prefixes)
+        path = [self.root]
+        previous = None
+        answer = None
+
+        for position in order:
+            prefix = prefixes[position]
+
+            #(ii)
+            if prefix == previous:
+                results[position] = list(answer)
+                continue
+            common = 0
+            limit = len(path) - 1
+            if len(prefix) < limit:
+                limit = len(prefix)
+            while common < limit and prefix[common] == previous[common]:
+                common += 1
+            del path[common+1:]
+            current = path[common]
+            for char in prefix[common:]:
+                current = current.child(char)
+                if current is None:
+                    break
+                path.append(current)
+            previous = prefix
+            if current is None or current.best_terminal is None:
+                answer = [None,None,0]
+                results[position] = answer
+                continue
+
+            #(iii)
+            terminal = current.best_terminal
+            answer = [terminal.word,self.resolve(terminal.definition),current.unique_freq]
+            results[position] = answer
+
+        return results
+
+    def prefix_search_iter(self,prefix : str):
+        """
+        Function description:
+            prefix_search_iter function is a generator which yields every word with the prefix given in descending order of frequency,
+            words with the same frequency are yielded lexicographically. Only the words which are consumed are searched for.
+
+        Approach description (if main function):
+            (i) For loop is used to iterate through each character in the prefix, nothing is yielded if there is no words which consits of the prefix given.
+
+            (ii) Initialise a heap frontier with the node reached, each entry of the heap is (-frequency, word, order, node) where
+                 frequency is current_max_frequency of the node (the highest frequency in its subtree) or the frequency of a terminal node,
+                 word is the characters from the root to the node, and order breaks ties without comparing nodes.
+
+            (iii) While the frontier is not empty, pop the entry with the highest frequency.
+                  If it is a terminal node, no word left in the frontier can have a higher frequency, thus, the word is yielded.
+                  Else, all children of the node are pushed into the frontier.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+
+        :Output, return or postcondition:
+            Yields lists which consists of 3 elements, the word, the definition of the word and the frequency of the word.
+
+        :Time complexity: O(M + i log i + L), M is the length of the prefix, i is the number of words yielded,
+                          L is the total length of the paths to the i words yielded
+
+        :Aux space complexity: O(i + L), the frontier holds the children of every node expanded
+        """
+        #(i)
+        current = self.root
+        for char in prefix:
+            current = current.child(char)
+            if current is None:
+                return
+
+        #(ii)
+        order = 0
+        frontier = [(-current.current_max_frequency,prefix,order,current)]
+
+        #(iii)
+        while frontier:
+            frequency,word,_,current = heapq.heappop(frontier)
+            if current.definition is not None:
+                yield [word,self.resolve(current.definition),-frequency]
+                continue
+            for index,child in current.children():
+                order += 1
+                if index == 0:
+                    heapq.heappush(frontier,(-child.frequency,word,order,child))
+                else:
+                    heapq.heappush(frontier,(-child.current_max_frequency,word+chr(index-1),order,child))
+
+    def fuzzy_prefix_search(self, prefix:str, max_edits:int) -> list[str,str,int]:
+        """
+        Function description:
+            fuzzy_prefix_search function is used to search for the word with the highest frequency among the words which start with
+            any prefix within max_edits insertions, deletions or substitutions of the prefix given.
+
+        Approach description (if main function):
+            (i)  Initialise a stack with the root and the first row of the Levenshtein table of the prefix, row[i] is the edit distance
+                 between the first i characters of the prefix and the characters from the root to a node.
+                 Each entry of the stack is a group of nodes which share the same row, so that a row is computed once for the whole group.
+
+            (ii) For each group popped from the stack:
+                 If row[-1] <= max_edits, the characters to the nodes are within the budget, thus, every word below the nodes matches.
+                 best_terminal and unique_freq of each node are taken and the nodes are not descended, so that no word is counted twice.
+                 Else, an entry of the row can only become <= max_edits through a match of prefix[i] where row[i] <= max_edits,
+                 thus, only these characters (useful) need their own row, the row for every other character (other) is computed once
+                 and gives the same entries <= max_edits.
+                 The children of the nodes are grouped by useful character, and the rest of the children form one group with other.
+                 If every entry of other is > max_edits, only the children of the useful characters are looked up, else every child is visited.
+                 A group is only pushed if some entry of its row is <= max_edits, since no longer prefix can be within the budget otherwise.
+
+            (iii) The best terminal is the one with the highest frequency, words with the same frequency are compared lexicographically,
+                  the same as prefix_search.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched, possibly mistyped.
+            argv2 : max_edits : The number of edits allowed, 0 is the same as prefix_search.
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, the word with the highest frequency, its definition and
+            the number of unique words that starts with a matching prefix ([None,None,0] if there is none).
+
+        :Time complexity: O(V * E + R * M), V is the number of nodes within max_edits of a prefix of the prefix given,
+                          at most the nodes of depth M + max_edits, E is max_edits, at most 2E + 1 characters are useful for a row,
+                          R is the number of groups, M is the length of the prefix
+
+        :Aux space complexity: O(V + R * M)
+        """
+        if max_edits < 0:
+            raise ValueError("max_edits must not be negative")
+
+        def next_row(row,char):
+            left = row[0] + 1
+            result = [left]
+            for expected,diagonal,above in zip(prefix,row,row[1:]):
+                if expected != char:
+                    diagonal += 1
+                if above + 1 < diagonal:
+                    diagonal = above + 1
+                if left + 1 < diagonal:
+                    diagonal = left + 1
+                result.append(diagonal)
+                left = diagonal
+            return result
+
+        #(i)
+        best = None
+        count = 0
+        stack = [([self.root],list(range(len(prefix)+1)))]
+
+        #(ii)
+        while stack:
+            nodes,row = stack.pop()
+            if row[-1] <= max_edits:
+                for current in nodes:
+                    terminal = current.best_terminal
+                    if terminal is not None:
+                        count += current.unique_freq
+                        #(iii)
+                        if best is None or (-terminal.frequency,terminal.word) < (-best.frequency,best.word):
+                            best = terminal
+                continue
+            groups = {prefix[position] : [] for position in range(len(prefix)) if row[position] <= max_edits}
+            other = next_row(row,None)
+            if min(other) > max_edits:
+                for current in nodes:
+                    for char in groups:
+                        child = current.child(char)
+                        if child is not None:
+                            groups[char].append(child)
+            else:
+                rest = []
+                for current in nodes:
+                    for index,child in current.children():
+                        if index > 0:
+                            groups.get(chr(index - 1),rest).append(child)
+                if rest:
+                    stack.append((rest,other))
+            for char in groups:
+                if groups[char]:
+                    stack.append((groups[char],next_row(row,char)))
+
+        if best is None:
+            return [None,None,0]
+        return [best.word,self.resolve(best.definition),count]
+
+    def snapshot(self) -> list[bytes]:
+        """
+        Function description:
+            snapshot function is used to lay the Trie out flat in the compact binary snapshot format,
+            which is written to a file by save or placed in shared memory by SharedTrie.
+
+        Approach description (if main function):
+            (i)  Number the non terminal nodes in breadth first order, so that the children of a node get consecutive edges.
+                 For each node, 4 int32 are written: the first edge, the number of edges, unique_freq and the id of the word of best_terminal (-1 if none).
+                 For each edge, the code point of the character and the id of the child are written into 2 separate int32 arrays,
+                 the edges of a node are sorted by code point, so that they can be searched with binary search.
+
+            (ii) Number the terminal nodes as they are found, for each word 5 int64 are written: the offset and length of the word,
+                 the offset and length of the definition in the string section, and the frequency.
+                 The words and definitions are encoded in UTF-8 into the string section.
+
+            (iii) The header (magic, version, number of nodes, edges, words and bytes of strings) is followed by the sections,
+                  each section is padded to 8 bytes. Arrays are in native byte order.
+
+        :Output, return or postcondition:
+            A list of the parts of the snapshot in order, the snapshot is their concatenation.
+
+        :Time complexity: O(T + D), T is the total number of characters in the Trie, D is the total number of characters in the definitions
+
+        :Aux space complexity: O(T + D)
+        """
+        #(i)
+        nodes = array('i')
+        codes = array('i')
+        children = array('i')
+        words = array('q')
+        strings = bytearray()
+        word_ids = {}
+
+        #(ii)
+        def word_id(terminal):
+            if id(terminal) not in word_ids:
+                word_ids[id(terminal)] = len(words) // 5
+                word = terminal.word.encode("utf-8")
+                definition = self.resolve(terminal.definition).encode("utf-8")
+                words.extend((len(strings),len(word),len(strings)+len(word),len(definition),terminal.frequency))
+                strings.extend(word)
+                strings.extend(definition)
+            return word_ids[id(terminal)]
+
+        order = [self.root]
+        for current in order:
+            first = len(codes)
+            for index,child in current.children():
+                if index == 0:
+                    word_id(child)
+                else:
+                    codes.append(index - 1)
+                    children.append(len(order))
+                    order.append(child)
+            best = -1 if current.best_terminal is None else word_id(current.best_terminal)
+            nodes.extend((first,len(codes)-first,current.unique_freq,best))
+
+        #(iii)
+        parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC,SNAPSHOT_VERSION,len(order),len(codes),len(words)//5,len(strings))]
+        for section in (nodes,codes,children,words,strings):
+            data = bytes(section)
+            parts.append(data)
+            parts.append(bytes(-len(data) % 8))
+        return parts
+
+    def save(self, path:str) -> None:
+        """
+        Function description:
+            save function is used to write the Trie into a compact binary snapshot, which can be opened with Trie.open without rebuilding.
+
+        :Input:
+            path : The path of the snapshot file.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(T + D) (Details at snapshot)
+
+        :Aux space complexity: O(T + D)
+        """
+        with open(path,"wb") as outfile:
+            for part in self.snapshot():
+                outfile.write(part)
+
+    @staticmethod
+    def open(path:str) -> 'TrieSnapshot':
+        """
+        Function description:
+            open function is used to open a snapshot written by Trie.save, the file is memory mapped and queried in place.
+
+        :Input:
+            path : The path of the snapshot file.
+
+        :Output, return or postcondition:
+            A TrieSnapshot over the memory mapped file.
+
+        :Time complexity: O(1), no part of the file is read except the header
+
+        :Aux space complexity: O(1), the pages of the file are shared through the page cache
+        """
+        with open(path,"rb") as infile:
+            mapped = mmap.mmap(infile.fileno(),0,access=mmap.ACCESS_READ)
+        return TrieSnapshot(mapped)
+
+class TrieSnapshot:
+    def __init__(self, buffer) -> None:
+        """
+        Function description:
+            init function is used to initialise a TrieSnapshot, a read only Trie which answers queries directly from a buffer in the format written by Trie.save.
+
+        :Input:
+            buffer : The buffer holding the snapshot, such as a memory mapped file.
+
+        :args:
+            self.buffer : The buffer holding the snapshot.
+            self.nodes, self.codes, self.children, self.words : int views over the sections of the buffer, see Trie.save.
+            self.strings : A view over the UTF-8 string section of the buffer.
+
+        :Output, return or postcondition:
+            ValueError is raised if the buffer is not a snapshot.
+
+        :Time complexity: O(1), only views are created, nothing is copied
+
+        :Aux space complexity: O(1)
+        """
+        self.buffer = buffer
+        magic,version,node_count,edge_count,word_count,strings_size = SNAPSHOT_HEADER.unpack_from(buffer,0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("buffer is not a Trie snapshot")
+        view = memoryview(buffer)
+        position = SNAPSHOT_HEADER.size
+        self.views = []
+        for size,code in ((16*node_count,'i'),(4*edge_count,'i'),(4*edge_count,'i'),(40*word_count,'q'),(strings_size,'B')):
+            self.views.append(view[position:position+size].cast(code))
+            position += size + (-size % 8)
+        self.views.append(view)
+        self.nodes,self.codes,self.children,self.words,self.strings = self.views[:5]
+
+    def prefix_search(self,prefix : str) -> list[str,str,int]:
+        """
+        Function description:
+            prefix_search function is used to search for the word with the prefix given which has the highest frequency in the snapshot,
+            the answer is the same as Trie.prefix_search on the Trie saved.
+
+        Approach description (if main function):
+            (i) For each character in the prefix, the edges of the current node are searched with binary search on the code point,
+                return [None,None,0] if there is no such edge.
+
+            (ii) The word of best_terminal of the node reached is decoded from the string section.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+
+        :Output, return or postcondition:
+            Same as Trie.prefix_search.
+
+        :Time complexity: O(M log C + N + D), M is the length of the prefix, N and D are the length of the word and the definition decoded, C is the number of children of a node
+
+        :Aux space complexity: O(N + D)
+        """
+        nodes = self.nodes
+        codes = self.codes
+
+        #(i)
+        current = 0
+        for char in prefix:
+            first = nodes[4*current]
+            last = first + nodes[4*current+1]
+            code = ord(char)
+            position = bisect.bisect_left(codes,code,first,last)
+            if position == last or codes[position] != code:
+                return [None,None,0]
+            current = self.children[position]
+
+        #(ii)
+        best = nodes[4*current+3]
+        if best < 0:
+            return [None,None,0]
+        words = self.words
+        word = str(self.strings[words[5*best]:words[5*best]+words[5*best+1]],"utf-8")
+        definition = str(self.strings[words[5*best+2]:words[5*best+2]+words[5*best+3]],"utf-8")
+        return [word,definition,nodes[4*current+2]]
+
+    def close(self) -> None:
+        """
+        Function description:
+            close function is used to release the views over the buffer and close the buffer if it can be closed, such as a memory mapped file.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        for view in self.views:
+            view.release()
+        self.views = []
+        if hasattr(self.buffer,"close"):
+            self.buffer.close()
+
+class SharedTrie:
+    def __init__(self, trie:Trie, processes:int = None, batch_size:int = 1024) -> None:
+        """
+        Function description:
+            init function is used to initialise a SharedTrie, a query service which places the snapshot of a Trie (Details at Trie.snapshot)
+            in one shared memory block, and answers batches of prefixes with a process pool.
+            Each worker maps the same block and searches it with a TrieSnapshot, so the Trie is neither copied nor pickled to the workers,
+            and the memory used does not grow with the number of processes.
+
+        :Input:
+            trie : The Trie to be served, later changes to it are not seen.
+            processes : The number of worker processes, None (default) uses the number of processors.
+            batch_size : The number of prefixes sent to a worker at a time.
+
+        :args:
+            self.memory : The shared memory block holding the snapshot.
+            self.snapshot : A TrieSnapshot over the block, used for single queries in this process.
+            self.pool : The process pool, each worker attaches the block once with shared_worker_start.
+            self.batch_size : The number of prefixes sent to a worker at a time.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(T + D) to build the snapshot (Details at Trie.snapshot)
+
+        :Aux space complexity: O(T + D), the shared memory block
+        """
+        parts = trie.snapshot()
+        self.memory = shared_memory.SharedMemory(create=True,size=sum(len(part) for part in parts))
+        position = 0
+        for part in parts:
+            self.memory.buf[position:position+len(part)] = part
+            position += len(part)
+        self.snapshot = TrieSnapshot(self.memory.buf)
+        self.pool = ProcessPoolExecutor(processes,initializer=shared_worker_start,initargs=(self.memory.name,))
+        self.batch_size = batch_size
+
+    def prefix_search(self, prefix:str) -> list[str,str,int]:
+        """
+        Function description:
+            prefix_search function is used to answer a single prefix in this process, a round trip to a worker would cost more than the search.
+
+        :Input:
+            prefix : The prefix of the word to be searched.
+
+        :Output, return or postcondition:
+            Same as Trie.prefix_search.
+
+        :Time complexity: Same as TrieSnapshot.prefix_search
+
+        :Aux space complexity: Same as TrieSnapshot.prefix_search
+        """
+        return self.snapshot.prefix_search(prefix)
+
+    def prefix_search_many(self, prefixes:list[str]) -> list[list[str,str,int]]:
+        """
+        Function description:
+            prefix_search_many function is used to answer a list of prefixes with the process pool,
+            the prefixes are split into batches of self.batch_size which are searched by the workers in parallel.
+
+        :Input:
+            prefixes : The list of prefixes to be searched.
+
+        :Output, return or postcondition:
+            A list with the answer of prefix_search for each prefix, in the same order as prefixes.
+
+        :Time complexity: O(S / W), S is the total time of the searches, W is the number of workers, plus sending the prefixes and the answers
+
+        :Aux space complexity: O(P), P is the number of prefixes
+        """
+        batches = [prefixes[position:position+self.batch_size] for position in range(0,len(prefixes),self.batch_size)]
+        results = []
+        for answers in self.pool.map(shared_worker_search,batches):
+            results.extend(answers)
+        return results
+
+    def close(self) -> None:
+        """
+        Function description:
+            close function is used to stop the workers, release the views over the block, and free the shared memory block.
+
+        :Time complexity: O(W), W is the number of workers
+
+        :Aux space complexity: O(1)
+        """
+        self.pool.shutdown()
+        self.snapshot.close()
+        self.memory.close()
+        self.memory.unlink()
+
+class DefinitionStore:
+    def __init__(self, filename:str) -> None:
+        """
+        Function description:
+            init function is used to initialise a DefinitionStore, which reads definitions on demand from a memory mapped dictionary file,
+            so that a Trie only keeps an int reference for each definition instead of the definition itself.
+            Only the pages of the definitions which are read are brought into memory, and they are shared through the page cache.
+
+        :Input:
+            filename : The path of the dictionary file, the same file read by stream_dictionary with offsets=True.
+
+        :args:
+            self.buffer : The memory mapped file (an empty bytes object for an empty file, which cannot be mapped).
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1), no part of the file is read
+
+        :Aux space complexity: O(1)
+        """
+        with open(filename,"rb") as infile:
+            if os.fstat(infile.fileno()).st_size:
+                self.buffer = mmap.mmap(infile.fileno(),0,access=mmap.ACCESS_READ)
+            else:
+                self.buffer = b""
+
+    @staticmethod
+    def pack(offset:int, length:int) -> int:
+        """
+        Function description:
+            pack function is used to pack the byte offset and byte length of a definition in the file into one int reference.
+
+        :Input:
+            offset : The byte offset of the definition in the file.
+            length : The number of bytes of the definition, less than 2 ** DEFINITION_BITS.
+
+        :Output, return or postcondition:
+            The reference, offset in the high bits and length in the low DEFINITION_BITS bits.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        return (offset << DEFINITION_BITS) | length
+
+    def get(self, reference:int) -> str:
+        """
+        Function description:
+            get function is used to read the definition of a reference from pack.
+
+        :Input:
+            reference : The reference of the definition.
+
+        :Output, return or postcondition:
+            The definition decoded from UTF-8.
+
+        :Time complexity: O(D), D is the length of the definition
+
+        :Aux space complexity: O(D)
+        """
+        offset = reference >> DEFINITION_BITS
+        length = reference & ((1 << DEFINITION_BITS) - 1)
+        return str(self.buffer[offset:offset+length],"utf-8")
+
+    def close(self) -> None:
+        """
+        Function description:
+            close function is used to close the memory mapped file, the Trie using the store cannot return definitions afterwards.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        if hasattr(self.buffer,"close"):
+            self.buffer.close()
+
+class TypeaheadSession:
+    def __init__(self, trie:Trie) -> None:
+        """
+        Function description:
+            init function is used to initialise a TypeaheadSession, a cursor on a Trie which follows the prefix typed one keystroke at a time.
+
+        :Input:
+            trie : The Trie to be searched.
+
+        :args:
+            self.trie : The Trie to be searched.
+            self.nodes : The list of nodes reached by each prefix typed so far, self.nodes[i] is the node after i characters,
+                         None once the prefix is not in the Trie.
+
+        :Output, return or postcondition:
+            TypeError is raised if trie is not a Trie, CompactTrie and RadixTrie keep their children in another form.
+
+        :Time complexity: O(1) Only initialisation
+
+        :Aux space complexity: O(1)
+        """
+        if not isinstance(trie,Trie):
+            raise TypeError("TypeaheadSession needs a Trie")
+        self.trie = trie
+        self.nodes = [trie.root]
+
+    def push(self, char:str) -> None:
+        """
+        Function description:
+            push function is used to type one more character, the next node is found from the node of the current prefix instead of self.trie.root.
+
+        :Input:
+            char : The character typed.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1) amortised
+
+        :Aux space complexity: O(1) amortised
+        """
+        current = self.nodes[-1]
+        if current is not None:
+            current = current.child(char)
+        self.nodes.append(current)
+
+    def pop(self) -> None:
+        """
+        Function description:
+            pop function is used to remove the last character typed (backspace), nothing happens if no character has been typed.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        if len(self.nodes) > 1:
+            self.nodes.pop()
+
+    def result(self) -> list[str,str,int]:
+        """
+        Function description:
+            result function is used to get the same answer as self.trie.prefix_search for the prefix typed so far.
+            The nodes kept are not walked again, thus, a word inserted after the prefix went missing is not found until the prefix is typed again.
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, the word with the highest frequency which starts with the prefix typed,
+            the definition of the word and the number of unique words that starts with the prefix typed.
+
+        :Time complexity: O(1), read from best_terminal of the current node
+
+        :Aux space complexity: O(1)
+        """
+        current = self.nodes[-1]
+        if current is None or current.best_terminal is None:
+            return [None,None,0]
+        terminal = current.best_terminal
+        return [terminal.word,self.trie.resolve(terminal.definition),current.unique_freq]
+
+class CompactTrie:
+    def __init__(self, dictionary:list[tuple[str,str,int]]) -> None:
+        """
+        Function description:
+            init function is used to initialise a CompactTrie, a Trie which keeps its nodes in parallel typed arrays instead of one Node object per character.
+            A node is identified by an integer id, and the id is used as the position of the node in every array below.
+            Node 0 is the root, thus a child id of 0 is used to indicate that there is no child.
+
+        :Input:
+            dictionary : A list of tuples, each tuple consists of 3 elements, 1st element is the word, 2nd element is the definition of the word,
+                         3rd element is the frequency of the word.
+
+        :args:
+            self.link : An array of 27 child ids per node, the children of node i are stored at self.link[27*i : 27*i + 27].
+            self.definition : A list of the definition of each node (Only terminal node has definition).
+            self.frequency : An array of the frequency of each node.
+            self.next_word_highest_freq_index : An array of the index of the next character in the word with the highest frequency of each node.
+            self.current_max_frequency : An array of the current maximum frequency of each node.
+            self.unique_freq : An array of the number of unique words that starts with the same prefix of each node.
+
+        :Output, return or postcondition:
+            A for loop is used to iterate through the dictionary, and insert each word into the CompactTrie accordingly.
+
+        :Time complexity: O(T), T is the total number of characters in the dictionary, each word's character is visited once
+
+        :Aux space complexity: O(T), T is the total number of characters in the dictionary
+        """
+        self.link = array('i')
+        self.definition = []
+        self.frequency = array('q')
+        self.next_word_highest_freq_index = array('b')
+        self.current_max_frequency = array('q')
+        self.unique_freq = array('i')
+        self.new_node()
+        for data in dictionary:
+            self.insert(data[0],data)
+
+    def new_node(self, definition:str=None, frequency:int=0) -> int:
+        """
+        Function description:
+            new_node function is used to append a new node to the end of every array, it plays the same role as Node() does in Trie.
+
+        :Input:
+            definition : The definition of the word, None if it is not a terminal node.
+            frequency : The frequency of the word.
+
+        :Output, return or postcondition:
+            The id of the new node.
+
+        :Time complexity: O(1) amortised, 27 child slots are appended
+
+        :Aux space complexity: O(1)
+        """
+        self.link.extend(EMPTY_LINK)
+        self.definition.append(definition)
+        self.frequency.append(frequency)
+        self.next_word_highest_freq_index.append(0)
+        self.current_max_frequency.append(-1)
+        self.unique_freq.append(0)
+        return len(self.definition) - 1
+
+    def info_update(self,curr:int,index:int,frequency:int) -> None:
+        """
+        Function description:
+            info_update function is used to update the information of node curr, it follows the same 2 conditions as Trie.info_update.
+
+        :Input:
+            curr : The id of the current node.
+            index : The index of the character in the word.
+            frequency : The frequency of the word.
+
+        :Output, return or postcondition:
+           None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        current_max_frequency = self.current_max_frequency[curr]
+        if (current_max_frequency == frequency and self.next_word_highest_freq_index[curr] > index) or current_max_frequency < frequency:
+            self.current_max_frequency[curr] = frequency
+            self.next_word_highest_freq_index[curr] = index
+        self.unique_freq[curr] += 1
+
+    def insert(self, key:str, data:list[str,str,int]=None) -> None:
+        """
+        Function description:
+            insert function is used to insert words into the CompactTrie character by character.
+
+        Approach description (if main function):
+            Same as Trie.insert, except that a child is found at self.link[27*current + index] and
+            a missing child is created with new_node instead of Node().
+            When the word is already in the CompactTrie, the terminal node is overwritten in place rather than replaced by a new node.
+            Only the characters a to z have a child slot, thus, ValueError is raised for a word with any other character before anything is changed.
+
+        :Input:
+            argv1 : key : The word to be inserted into the CompactTrie character by character.
+            argv2 : data : A list which consists of 3 elements, 1st element is the word, 2nd element is the definition of the word, 3rd element is the frequency of the word.
+
+        :Output, return or postcondition:
+           None
+
+        :Time complexity: O(length), length is the length of the word as the loop iterates through each letter in the word
+
+        :Aux space complexity: O(length), worst case where a node is created for each letter of the word
+        """
+        link = self.link
+        frequency = data[2]
+        for char in key:
+            if not "a" <= char <= "z":
+                raise ValueError(f"CompactTrie only stores the characters a to z, not {char!r} in {key!r}")
+
+        #(i)
+        current = 0
+
+        #(ii)
+        for char in key:
+            index = ord(char) - 97 + 1
+            child = link[27*current + index]
+            if child == 0:
+                child = self.new_node()
+                link[27*current + index] = child
+            self.info_update(current,index,frequency)
+            current = child
+
+        #(iii)
+        terminal = link[27*current]
+        if terminal == 0:
+            link[27*current] = self.new_node(data[1],frequency)
+            self.info_update(current,0,frequency)
+        else:
+            self.info_update(current,0,frequency)
+            if self.current_max_frequency[current] <= frequency:
+                self.definition[terminal] = data[1]
+                self.frequency[terminal] = frequency
+
+    def prefix_search(self,prefix : str) -> list[str,str,int]:
+        """
+        Function description:
+            prefix_search function is used to search for the word with the prefix given which has the highest frequency in the CompactTrie.
+
+        Approach description (if main function):
+            Same as Trie.prefix_search, walking integer node ids through self.link instead of following Node references.
+            A character other than a to z has no child slot, and a node which no word passes through (the root of an empty CompactTrie)
+            has no best word, [None,None,0] is returned for both.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, the word with the highest frequency among the words which starts with the prefix given,
+            the definition of the word and the number of unique words that starts with the prefix given.
+
+        :Time complexity: O(M+N), M is the length of the prefix, N is the number of characters in the word with the highest frequency
+
+        :Aux space complexity: O(M+N)
+        """
+        link = self.link
+
+        #(i)
+        final_word = prefix
+        current = 0
+
+        #(ii)
+        for char in prefix:
+            if not "a" <= char <= "z":
+                return [None,None,0]
+            current = link[27*current + ord(char) - 97 + 1]
+            if current == 0:
+                return [None,None,0]
+
+        #(iii)
+        final_unique_frequency = self.unique_freq[current]
+        if final_unique_frequency == 0:
+            return [None,None,0]
+
+        while self.definition[current] is None:
+            index = self.next_word_highest_freq_index[current]
+            if index > 0:
+                final_word += chr(index+96)
+            current = link[27*current + index]
+
+        return [final_word,self.definition[current],final_unique_frequency]
+
+class RadixNode:
+    __slots__ = ("label","link","definition","frequency","next_word_highest_freq_index","current_max_frequency","unique_freq")
+
+    def __init__(self, label:str) -> None:
+        """
+        Function description:
+            init function is used to initialise a RadixNode, a node which is reached through an edge labelled with one or more characters.
+
+        :Input:
+            label : The characters on the edge from the parent node to this node.
+
+        :args:
+            self.label : The characters on the edge from the parent node to this node.
+            self.link : An array of 27 links, index 0 is the terminal node and index 1 to 26 are the children starting with a to z.
+            self.definition, self.frequency, self.next_word_highest_freq_index, self.current_max_frequency, self.unique_freq : Same as Node.
+            A RadixNode is not a Node, since its children are in self.link instead of a child table.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1) Only initialisation
+
+        :Aux space complexity: O(1) The label is a slice of the inserted word
+        """
+        self.label = label
+        self.link = [None]*27
+        self.definition = None
+        self.frequency = 0
+        self.next_word_highest_freq_index = 0
+        self.current_max_frequency = -1
+        self.unique_freq = 0
+
+class RadixTrie:
+    def __init__(self, dictionary:list[tuple[str,str,int]]) -> None:
+        """
+        Function description:
+            init function is used to initialise a RadixTrie, a path compressed Trie where a chain of nodes without any branch is merged into one edge.
+            Each non terminal node is a RadixNode, terminal nodes are the same as in Trie.
+            Like CompactTrie, it is not a Trie: it only supports insert and prefix_search, and only the characters a to z.
+
+        :Input:
+            dictionary : A list of tuples, each tuple consists of 3 elements, 1st element is the word, 2nd element is the definition of the word,
+                         3rd element is the frequency of the word.
+
+        :args:
+            self.root : A RadixNode object with an empty label which is the root of the RadixTrie.
+
+        :Output, return or postcondition:
+            A for loop is used to iterate through the dictionary, and insert each word into the RadixTrie accordingly.
+
+        :Time complexity: O(T), T is the total number of characters in the dictionary
+
+        :Aux space complexity: O(W), W is the number of words in the dictionary, each word adds at most 2 non terminal nodes and 1 terminal node
+        """
+        self.root = RadixNode("")
+        for data in dictionary:
+            self.insert(data[0],data)
+
+    def info_update(self,curr:RadixNode,index:int,frequency:int) -> None:
+        """
+        Function description:
+            info_update function is used to update the information of node curr, it follows the same 2 conditions as Trie.info_update.
+
+        :Input:
+            curr : The current node.
+            index : The index of the first character of the edge taken, 0 for the terminal node.
+            frequency : The frequency of the word.
+
+        :Output, return or postcondition:
+           None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        if (curr.current_max_frequency == frequency and curr.next_word_highest_freq_index > index) or curr.current_max_frequency < frequency:
+            curr.current_max_frequency = frequency
+            curr.next_word_highest_freq_index = index
+        curr.unique_freq += 1
+
+    def split(self, parent:RadixNode, index:int, length:int) -> RadixNode:
+        """
+        Function description:
+            split function is used to split the edge from parent to its child at parent.link[index] after the first length characters of the label.
+
+        Approach description (if main function):
+            A new RadixNode middle takes the first length characters of the label, and the child keeps the rest of the label.
+            Since every word which passes through middle also passes through the child, middle copies current_max_frequency and unique_freq
+            of the child, and next_word_highest_freq_index of middle points to the child.
+
+        :Input:
+            parent : The node which the edge starts from.
+            index : The index of the first character of the edge.
+            length : The number of characters to be kept on the edge from parent to middle, 0 < length < length of the label.
+
+        :Output, return or postcondition:
+            The new node middle.
+
+        :Time complexity: O(L), L is the length of the label, the label is sliced into 2
+
+        :Aux space complexity: O(L)
+        """
+        child = parent.link[index]
+        middle = RadixNode(child.label[:length])
+        child.label = child.label[length:]
+        child_index = ord(child.label[0]) - 97 + 1
+        middle.link[child_index] = child
+        middle.next_word_highest_freq_index = child_index
+        middle.current_max_frequency = child.current_max_frequency
+        middle.unique_freq = child.unique_freq
+        parent.link[index] = middle
+        return middle
+
+    def insert(self, key:str, data:list[str,str,int]=None) -> None:
+        """
+        Function description:
+            insert function is used to insert words into the RadixTrie edge by edge.
+
+        Approach description (if main function):
+            (i)  Initialise variable current with the value of self.root and variable position with 0 which is the number of characters of the key matched.
+
+            (ii) While there are characters of the key left, find the edge which starts with the next character.
+                (i) If there is no such edge, a new RadixNode with the rest of the key as label is created, and the loop terminates.
+                (ii) If the label only partially matches the key, the edge is split after the matched characters with split.
+                The information of current is updated with info_update as in Trie, and current is set to the next node.
+
+            (iii) Once we arrive at the last node of the key, the terminal node is created or updated the same way as Trie.insert.
+
+            ValueError is raised for a word with a character other than a to z before anything is changed.
+
+        :Input:
+            argv1 : key : The word to be inserted into the RadixTrie.
+            argv2 : data : A list which consists of 3 elements, 1st element is the word, 2nd element is the definition of the word, 3rd element is the frequency of the word.
+
+        :Output, return or postcondition:
+           None
+
+        :Time complexity: O(length), length is the length of the word, each character of the word is compared once
+
+        :Aux space complexity: O(length + definition), the new labels are slices of the word
+        """
+        for char in key:
+            if not "a" <= char <= "z":
+                raise ValueError(f"RadixTrie only stores the characters a to z, not {char!r} in {key!r}")
+
+        #(i)
+        current = self.root
+        position = 0
+
+        #(ii)
+        while position < len(key):
+            index = ord(key[position]) - 97 + 1
+            child = current.link[index]
+            if child is None:
+                child = RadixNode(key[position:])
+                current.link[index] = child
+                length = len(child.label)
+            elif key.startswith(child.label, position):
+                length = len(child.label)
+            else:
+                length = 1
+                while position + length < len(key) and key[position+length] == child.label[length]:
+                    length += 1
+                child = self.split(current,index,length)
+            self.info_update(current,index,data[2])
+            current = child
+            position += length
+
+        #(iii)
+        index = 0
+        if current.link[index] is None:
+            current.link[index] = Node([data[1],data[2]])
+            self.info_update(current,index,data[2])
+        else:
+            self.info_update(current,index,data[2])
+            if current.current_max_frequency <= data[2]:
+                current.link[index] = Node([data[1],data[2]])
+
+    def prefix_search(self,prefix : str) -> list[str,str,int]:
+        """
+        Function description:
+            prefix_search function is used to search for the word with the prefix given which has the highest frequency in the RadixTrie
+
+        Approach description (if main function):
+            (i) Initialise variable current with the value of self.root and variable position with 0.
+
+            (ii) Walk down the edges which match the prefix, return [None,None,0] once an edge does not match or a character is not a to z.
+                 When the prefix ends in the middle of an edge, the rest of the label becomes part of the final word.
+
+            (iii) Follow next_word_highest_freq_index edge by edge until the terminal node is reached, collecting the labels on the way.
+
+        :Input:
+            argv1 : prefix : The prefix of the word to be searched.
+
+        :Output, return or postcondition:
+            Same as Trie.prefix_search.
+
+        :Time complexity: O(M+N), M is the length of the prefix, N is the number of characters in the word with the highest frequency,
+                          but only one step is taken per edge instead of per character
+
+        :Aux space complexity: O(M+N)
+        """
+        #(i)
+        final_word = [prefix]
+        current = self.root
+        position = 0
+
+        #(ii)
+        while position < len(prefix):
+            if not "a" <= prefix[position] <= "z":
+                return [None,None,0]
+            current = current.link[ord(prefix[position]) - 97 + 1]
+            if current is None:
+                return [None,None,0]
+            label = current.label
+            if prefix.startswith(label, position):
+                position += len(label)
+            elif label.startswith(prefix[position:]):
+                final_word.append(label[len(prefix)-position:])
+                position = len(prefix)
+            else:
+                return [None,None,0]
+
+        #(iii)
+        final_unique_frequency = current.unique_freq
+        if final_unique_frequency == 0:
+            return [None,None,0]
+
+        while current.definition is None:
+            current = current.link[current.next_word_highest_freq_index]
+            if current.definition is None:
+                final_word.append(current.label)
+
+        return ["".join(final_word),current.definition,final_unique_frequency]
+
+class VersionedTrie(Trie):
+    def __init__(self, dictionary:list[tuple[str,str,int]], top_k:int = 0, cache_size:int = 0, frequency_order:bool = False) -> None:
+        """
+        Function description:
+            init function is used to initialise a VersionedTrie, a Trie which can be searched by many threads while another thread changes it.
+            A published node is never changed: a writer copies the nodes along the word, changes the copies and publishes the new root,
+            so that a reader which has read self.root keeps seeing one whole version of the Trie without taking any lock.
+            Writers are serialised by self.lock.
+
+        :Input:
+            dictionary : Same as Trie.
+            top_k : Same as Trie.
+            cache_size : Must be 0, the cache is changed by every prefix_search, thus, it cannot be shared by readers without a lock.
+            frequency_order : Must be False, the frequencies list of the root holds every word, thus, copying the lists along the word
+                              would make each change O(n) instead of O(length).
+
+        :args:
+            self.version : The number of changes published since the VersionedTrie was built.
+            self.lock : The lock held by insert, update_frequency and delete.
+            Other instances are the same as Trie.
+
+        :Output, return or postcondition:
+            The words are inserted in place by a Trie before the root is published, since no reader can see it yet.
+            ValueError is raised if cache_size is not 0 or frequency_order is True.
+
+        :Time complexity: Same as Trie
+
+        :Aux space complexity: Same as Trie
+        """
+        if cache_size:
+            raise ValueError("VersionedTrie does not support the result cache")
+        if frequency_order:
+            raise ValueError("VersionedTrie does not support frequency_order")
+        Trie.__init__(self,[],top_k)
+        self.root = Trie(dictionary,top_k).root
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def begin_write(self, key:str) -> Node:
+        """
+        Function description:
+            begin_write function is used to copy the root and the nodes along the word which are already in the Trie,
+            each copy is linked to the copy of its parent, so that the change can be made on the copies without changing a published node.
+
+        :Input:
+            key : The word to be changed.
+
+        :Output, return or postcondition:
+            The copy of the root, which is not published until commit_write.
+
+        :Time complexity: O(length * C), length is the length of the word, C is the number of children of a node
+
+        :Aux space complexity: O(length * C)
+        """
+        root = self.root.copy()
+        current = root
+        for char in key:
+            child = current.child(char)
+            if child is None:
+                break
+            child = child.copy()
+            current.add_child(char,child)
+            current = child
+        return root
+
+    def commit_write(self, root:Node) -> None:
+        """
+        Function description:
+            commit_write function is used to publish the root of a change, a single assignment which readers see either before or after.
+
+        :Input:
+            root : The root returned by begin_write.
 
         :Output, return or postcondition:
             None
 
-        :Time complexity: O(1) Initialisation 
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        self.root = root
+        self.version += 1
 
-        :Aux space complexity: O(1) No extra memory is used here
+    def insert(self, key:str, data:list[str,str,int]=None) -> None:
         """
-        self.depart = u 
-        self.arrive = v
-        self.flow = f
-        self.capacity = c
-        self.origin = None
-        self.front = None
-        self.behind = None
-    
-    def flow_augment(self, flow:int) -> None:
+        Function description:
+            insert function is used to insert a word with Trie.insert while holding self.lock.
+
+        :Time complexity: Same as Trie, plus O(length * C) for the copies (Details at begin_write)
+
+        :Aux space complexity: O(length * C)
+        """
+        with self.lock:
+            Trie.insert(self,key,data)
+
+    def update_frequency(self, key:str, frequency:int) -> None:
+        """
+        Function description:
+            update_frequency function is used to change the frequency of a word with Trie.update_frequency while holding self.lock.
+
+        :Time complexity: Same as Trie, plus O(length * C) for the copies (Details at begin_write)
+
+        :Aux space complexity: O(length * C)
+        """
+        with self.lock:
+            Trie.update_frequency(self,key,frequency)
+
+    def delete(self, key:str) -> None:
+        """
+        Function description:
+            delete function is used to remove a word with Trie.delete while holding self.lock.
+
+        :Time complexity: Same as Trie, plus O(length * C) for the copies (Details at begin_write)
+
+        :Aux space complexity: O(length * C)
+        """
+        with self.lock:
+            Trie.delete(self,key)
+
+    def frequency_build(self) -> None:
+        """
+        Function description:
+            frequency_build function is used to reject the frequencies lists, which a VersionedTrie does not keep (Details at __init__),
+            so that from_sorted with frequency_order=True raises ValueError as __init__ does.
+
+        :Output, return or postcondition:
+            ValueError is raised.
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        raise ValueError("VersionedTrie does not support frequency_order")
+
+class SubstringIndex:
+    def __init__(self, dictionary:list[tuple[str,str,int]], definitions:'DefinitionStore' = None) -> None:
+        """
+        Function description:
+            init function is used to initialise a SubstringIndex, a generalised suffix automaton of the words of the dictionary,
+            which answers the word with the highest frequency containing a string, and the number of words containing it.
+
+        Approach description (if main function):
+            (i)  A repeated word keeps the record with the highest frequency (the later one if equal).
+                 This is not the rule of Trie.insert, which keeps the first record when a longer word below it has a higher frequency
+                 than the new one, thus, a dictionary with repeated words can give a different definition or frequency than a Trie.
+
+            (ii) Each word is added to the automaton with extend, starting from the initial state 0.
+                 Every substring of every word reaches exactly one state, and the substrings which reach the same state occur in the same words.
+
+            (iii) The words are taken in descending order of frequency, then lexicographically, thus, the first word which reaches a state
+                  is its best word. For each word, the state of each of its prefixes is found, and the suffix links are followed from it until
+                  a state which is already marked with the word, so that each state containing the word counts it once.
+
+        :Input:
+            dictionary : A list of tuples, each tuple consists of 3 elements, 1st element is the word, 2nd element is the definition of the word,
+                         3rd element is the frequency of the word.
+            definitions : Same as Trie.
+
+        :args:
+            self.records : The records of the distinct words.
+            self.transitions : A list of dictionaries, self.transitions[s] maps a character to the next state of state s.
+            self.link : The suffix link of each state, -1 for the initial state.
+            self.length : The length of the longest string reaching each state.
+            self.count : The number of words containing the strings of each state.
+            self.best : The index in self.records of the best word of each state, -1 if none.
+            self.definitions : Same as Trie.
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(T * A), T is the total number of characters of the words, A is the number of suffix links followed per character,
+                          which is O(1) amortised for building and small for the counting in practice
+
+        :Aux space complexity: O(T), at most 2T states and 3T transitions
+        """
+        #(i)
+        positions = {}
+        self.records = []
+        for data in dictionary:
+            if data[0] not in positions:
+                positions[data[0]] = len(self.records)
+                self.records.append(data)
+            elif self.records[positions[data[0]]][2] <= data[2]:
+                self.records[positions[data[0]]] = data
+        self.definitions = definitions
+        self.transitions = [{}]
+        self.link = [-1]
+        self.length = [0]
+
+        #(ii)
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for data in self.records:
+                last = 0
+                for char in data[0]:
+                    last = self.extend(last,char)
+        finally:
+            if collecting:
+                gc.enable()
+
+        #(iii)
+        states = len(self.length)
+        self.count = array('i',[0])*states
+        self.best = array('i',[-1])*states
+        mark = array('i',[-1])*states
+        count = self.count
+        best = self.best
+        link = self.link
+        records = self.records
+        for position in sorted(range(len(records)),key=lambda position: (-records[position][2],records[position][0])):
+            word = records[position][0]
+            state = 0
+            for step in range(len(word) + 1):
+                following = state
+                while following != -1 and mark[following] != position:
+                    mark[following] = position
+                    count[following] += 1
+                    if best[following] < 0:
+                        best[following] = position
+                    following = link[following]
+                if step < len(word):
+                    state = self.transitions[state][word[step]]
+
+    def extend(self, last:int, char:str) -> int:
         """
         Function description:
-            flow_augment is used to update the flow of the edge once a path is found 
+            extend function is used to add one character after the state of the current prefix of a word, the generalised suffix automaton construction.
+
+        Approach description (if main function):
+            (i)  If last already has a transition on char (the prefix is also a substring of an earlier word), the state reached is used
+                 if it is solid (its longest string is the prefix), else it is cloned so that the prefix gets its own state.
+
+            (ii) Else, a new state cur is created, the transition on char is added to last and its suffix links until one has it,
+                 and the suffix link of cur is set, cloning the state reached if it is not solid, the same as the suffix automaton of one string.
+
+        :Input:
+            last : The state of the prefix of the word added so far.
+            char : The next character of the word.
+
+        :Output, return or postcondition:
+            The state of the prefix with char added.
+
+        :Time complexity: O(1) amortised, O(C) for a clone, C is the number of transitions copied
+
+        :Aux space complexity: O(1) amortised
+        """
+        transitions = self.transitions
+        link = self.link
+        length = self.length
+
+        #(i)
+        if char in transitions[last]:
+            following = transitions[last][char]
+            if length[last] + 1 == length[following]:
+                return following
+            clone = len(length)
+            transitions.append(dict(transitions[following]))
+            link.append(link[following])
+            length.append(length[last] + 1)
+            link[following] = clone
+            state = last
+            while state != -1 and transitions[state].get(char) == following:
+                transitions[state][char] = clone
+                state = link[state]
+            return clone
+
+        #(ii)
+        current = len(length)
+        transitions.append({})
+        link.append(0)
+        length.append(length[last] + 1)
+        state = last
+        while state != -1 and char not in transitions[state]:
+            transitions[state][char] = current
+            state = link[state]
+        if state != -1:
+            following = transitions[state][char]
+            if length[state] + 1 == length[following]:
+                link[current] = following
+            else:
+                clone = len(length)
+                transitions.append(dict(transitions[following]))
+                link.append(link[following])
+                length.append(length[state] + 1)
+                while state != -1 and transitions[state].get(char) == following:
+                    transitions[state][char] = clone
+                    state = link[state]
+                link[following] = clone
+                link[current] = clone
+        return current
+
+    def substring_search(self, infix:str) -> list[str,str,int]:
+        """
+        Function description:
+            substring_search function is used to search for the word with the highest frequency which contains the string given.
+
+        Approach description (if main function):
+            (i)  Follow the transitions from the initial state for each character, return [None,None,0] if one is missing.
+
+            (ii) The best word and the count of the state reached are the answer.
+
+        :Input:
+            argv1 : infix : The string to be searched for in the words.
+
+        :Output, return or postcondition:
+            A list which consists of 3 elements, the word with the highest frequency which contains infix
+            (lexicographically smaller if equal), its definition, and the number of distinct words which contain infix.
+            The same shape as Trie.prefix_search.
+
+        :Time complexity: O(X), X is the length of infix
+
+        :Aux space complexity: O(1)
+        """
+        #(i)
+        state = 0
+        for char in infix:
+            state = self.transitions[state].get(char)
+            if state is None:
+                return [None,None,0]
+
+        #(ii)
+        best = self.best[state]
+        if best < 0:
+            return [None,None,0]
+        data = self.records[best]
+        definition = data[1] if self.definitions is None else self.definitions.get(data[1])
+        return [data[0],definition,self.count[state]]
+
+def subtrie_build(dictionary:list[tuple[str,str,int]], top_k:int) -> Node:
+    """
+    Function description:
+        subtrie_build function is used by Trie.from_sorted to build the words which share the same first character in a worker process.
+
+    :Input:
+        dictionary : A list of tuples (word, definition, frequency), sorted by word with no repeated word, all starting with the same character.
+        top_k : Same as Trie.
+
+    :Output, return or postcondition:
+        The root of the subtrie, only its child at the first character is used.
+
+    :Time complexity: O(T), T is the total number of characters in the dictionary given
+
+    :Aux space complexity: O(T)
+    """
+    gc.disable()
+    trie = Trie([],top_k)
+    trie.build_sorted(dictionary)
+    return trie.root
+
+shared_worker_memory = None
+shared_worker_snapshot = None
+
+def shared_worker_start(name:str) -> None:
+    """
+    Function description:
+        shared_worker_start function is run once in each worker of a SharedTrie, it attaches the shared memory block by name
+        and keeps a TrieSnapshot over it for shared_worker_search.
+
+    :Input:
+        name : The name of the shared memory block.
+
+    :Output, return or postcondition:
+        None
+
+    :Time complexity: O(1), the block is mapped, not copied
+
+    :Aux space complexity: O(1)
+    """
+    global shared_worker_memory, shared_worker_snapshot
+    shared_worker_memory = shared_memory.SharedMemory(name=name)
+    shared_worker_snapshot = TrieSnapshot(shared_worker_memory.buf)
+
+def shared_worker_search(prefixes:list[str]) -> list[list[str,str,int]]:
+    """
+    Function description:
+        shared_worker_search function is used by a worker of a SharedTrie to answer a batch of prefixes from its TrieSnapshot.
+
+    :Input:
+        prefixes : The batch of prefixes.
+
+    :Output, return or postcondition:
+        A list with the answer of prefix_search for each prefix.
+
+    :Time complexity: O(P * M log C), P is the number of prefixes, M is the length of a prefix, C is the number of children of a node
+
+    :Aux space complexity: O(P)
+    """
+    return [shared_worker_snapshot.prefix_search(prefix) for prefix in prefixes]
 
-        :Input:
-            flow : the flow that which will be updated to the edge
+### DO NOT CHANGE THIS FUNCTION
+def load_dictionary(filename):
+    infile = open(filename)
+    word, frequency = "", 0
+    aList = []
+    for line in infile:
+        line.strip()
+        if line[0:4] == "word":
+            line = line.replace("word: ","")
+            line = line.strip()
+            word = line            
+        elif line[0:4] == "freq":
+            line = line.replace("frequency: ","")
+            frequency = int(line)
+        elif line[0:4] == "defi":
+            index = len(aList)
+            line = line.replace("definition: ","")
+            definition = line.replace("\n","")
+            aList.append([word,definition,frequency])
 
-        :Output, return or postcondition:
-            None
+    return aList
 
-        :Time complexity: O(1) Updating the flow of the edge, which is a constant time operation 
+def stream_dictionary(filename:str, chunk_size:int = 1 << 20, offsets:bool = False):
+    """
+    Function description:
+        stream_dictionary function is a generator which reads the same file format as load_dictionary,
+        but yields each [word, definition, frequency] as soon as its definition line is read instead of building a list of the whole file.
 
-        :Aux space complexity: O(1) No extra memory is used here, only updating the flow of the edge
-        """
-        self.flow += flow
-    
-    def starting_point (self, edge:'Edge') -> 'Edge' :
-        """
-        Function description:
-            starting_point is used to set up a pointer at flowGraph which represents the current edge
+    Approach description (if main function):
+        (i)  The file is read in binary chunks of chunk_size bytes, the bytes after the last newline of a chunk are kept and
+             put in front of the next chunk, so that no line is split.
 
-        :Input:
-            edge : The edge of flowGraph to the current edge
+        (ii) Each line is handled the same way as load_dictionary, a "word" line sets the word, a "freq" line sets the frequency,
+             and a "defi" line yields a record with the current word and frequency.
+             Lines are decoded as UTF-8 and a trailing carriage return is removed, as reading the file in text mode would do.
+             The byte offset of each line in the file is kept, so that if offsets is True, the definition is not decoded and
+             a reference to its bytes from DefinitionStore.pack is yielded instead.
 
-        :Output, return or postcondition:
-            The updated current edge will be returned
+    :Input:
+        filename : The path of the dictionary file.
+        chunk_size : The number of bytes read at a time.
+        offsets : A boolean value to indicate whether a reference is yielded instead of each definition, False (default) yields the definitions.
 
-        :Time complexity: O(1) 
+    :Output, return or postcondition:
+        Yields lists which consists of 3 elements, the word, the definition of the word (or its reference) and the frequency of the word.
 
-        :Aux space complexity: O(1) No extra memory is used here
-        """
-        self.origin = edge
-        return self
-    
-    def residue_front (self,edge) :
-        """
-        Function description:
-            residue_front is used to set up a pointer to the front edge of the current edge at residualNetwork
+    :Time complexity: O(F), F is the size of the file
 
-        :Input:
-            edge : The forward edge to the current edge
+    :Aux space complexity: O(chunk_size + L), L is the length of the longest line
+    """
+    word, frequency = "", 0
+    rest = b""
+    position = 0
+    with open(filename,"rb") as infile:
+        while rest is not None:
+            #(i)
+            chunk = infile.read(chunk_size)
+            if chunk:
+                lines = (rest + chunk).split(b"\n")
+                rest = lines.pop()
+            else:
+                lines = [rest] if rest else []
+                rest = None
 
-        :Output, return or postcondition:
-            The updated current edge will be returned
+            #(ii)
+            for line in lines:
+                start = position
+                position += len(line) + 1
+                if line[0:4] == b"word":
+                    word = line.decode("utf-8").replace("word: ","").strip()
+                elif line[0:4] == b"freq":
+                    frequency = int(line.decode("utf-8").replace("frequency: ",""))
+                elif line[0:4] == b"defi":
+                    if line[-1:] == b"\r":
+                        line = line[:-1]
+                    if offsets:
+                        label = len(b"definition: ") if line.startswith(b"definition: ") else 0
+                        yield [word,DefinitionStore.pack(start + label,len(line) - label),frequency]
+                    else:
+                        yield [word,line.decode("utf-8").replace("definition: ",""),frequency]
 
-        :Time complexity: O(1) 
+def load_trie(filename:str, chunk_size:int = 1 << 20, top_k:int = 0, cache_size:int = 0, lazy:bool = False) -> tuple[Trie,float]:
+    """
+    Function description:
+        load_trie function is used to build a Trie straight from a dictionary file, each record from stream_dictionary is inserted
+        as soon as it is read, so the records of the whole file are never held in memory at the same time.
+        If lazy is True, the Trie keeps a reference to each definition and reads it from a DefinitionStore over the same file
+        when it is returned, so the definitions are never held in memory.
 
-        :Aux space complexity: O(1) No extra memory is used here
-        """
-        self.front = edge
-        return self
-    
-    def residue_behind (self,edge) :
-        """
-        Function description:
-            residue_behind is used to set up a pointer to the behind edge of the current edge at residualNetwork
+    :Input:
+        filename : The path of the dictionary file.
+        chunk_size : The number of bytes read at a time (Details at stream_dictionary).
+        top_k : Same as Trie.
+        cache_size : Same as Trie.
+        lazy : A boolean value to indicate whether the definitions are read on demand, False (default) keeps them in the Trie.
 
-        :Input:
-            edge : The behind edge to the current edge
+    :Output, return or postcondition:
+        A tuple of the Trie built and the number of records inserted per second.
 
-        :Output, return or postcondition:
-            The updated current edge will be returned
+    :Time complexity: O(F + T), F is the size of the file, T is the total number of characters of the words
 
-        :Time complexity: O(1) 
+    :Aux space complexity: O(T + D + chunk_size), the Trie, the definitions D (none if lazy) and one chunk of the file
+    """
+    trie = Trie([],top_k,cache_size,DefinitionStore(filename) if lazy else None)
+    count = 0
+    start = time.perf_counter()
+    for data in stream_dictionary(filename,chunk_size,lazy):
+        trie.insert(data[0],data)
+        count += 1
+    elapsed = time.perf_counter() - start
+    return trie, (count / elapsed if elapsed > 0 else 0.0)
 
-        :Aux space complexity: O(1) No extra memory is used here
-        """
-        self.behind = edge
-        return self
+#Question 2
+from collections import deque
 
 class FlowGraph:
     def __init__ (self, sources:list[int], sinks:list[int], vertices:int) -> None:
@@ -400,15 +3024,16 @@ class FlowGraph:
             self.sinks : The list of sinks in the circulation network with demand
             self.super_source : The initialised position for super source in flowGraph
             self.super_sink : The initialised position for super sink in flowGraph
-            self.vertices : The list of vertices in the FlowGraph
-            self.residual_network : The residual network of the FlowGraph
+            self.last_edge : The number of the last edge formed which leaves each vertex, -1 if there is none
+            self.residual_network : The residual network of the FlowGraph, which is the only store of the edges, their capacities and their flows
             self.people : The number of people in the circulation network with demand
-            self.edgesToSuperSink : The list of edges that are connected to the super sink
+            self.edgesToSuperSink : The list of the numbers of the edges that are connected to the super sink
+            self.augmentations : The number of paths augmented by ford_fulkerson
 
         :Output, return or postcondition:
             None
 
-        :Time complexity: O(V + 2) = O(V), V as the number of vertices in the FlowGraph, iterating through all vertices once
+        :Time complexity: O(V + 2) = O(V), V as the number of vertices in the FlowGraph
 
         :Aux space complexity: O(2V+4) = O(V), V as the number of vertices in the FlowGraph, create FlowGraph and residualNetwork
         """
@@ -416,14 +3041,13 @@ class FlowGraph:
         self.sinks = sinks
         self.super_source = vertices #Super Source
         self.super_sink = vertices + 1 #Super Sink
-        self.vertices = [None]*(vertices + 2)
-        for i in range(vertices + 2):
-            self.vertices[i] = Vertex(i)
+        self.last_edge = array('i',[-1])*(vertices + 2)
         self.residual_network = ResidualNetwork(vertices, self)
         self.people = None 
         self.edgesToSuperSink = []
+        self.augmentations = 0
     
-    def superSource (self) -> None:
+    def superSource (self, backward:bool = False) -> None:
         """
         Function description:
             superSource is used to initialise the super source in the FlowGraph which allows Ford Fulkerson algorithm to work
@@ -450,7 +3074,7 @@ class FlowGraph:
                     Space Complexity : O(1), no extra memory is used here
 
         :Input:
-            None
+            backward : Same as formEdge, push_relabel needs the behind arcs to return flow to the super source
             
         :Instances:
             None
@@ -467,13 +3091,13 @@ class FlowGraph:
         
         #(ii)
         for i in range(1,len(self.sources)):
-            self.formEdge(self.super_source, self.sources[i], 2, False)
-            self.edgesToSuperSink.append(self.vertices[self.sources[i]].edges[-1])
+            self.formEdge(self.super_source, self.sources[i], 2, backward)
+            self.edgesToSuperSink.append(self.last_edge[self.sources[i]])
         
         #(iii)    
-        self.formEdge(self.super_source, self.sources[0], total_people, False)
+        self.formEdge(self.super_source, self.sources[0], total_people, backward)
     
-    def superSink (self):
+    def superSink (self, backward:bool = False):
         """
         Function description:
             superSink is used to initialise the super sink in the FlowGraph which allows Ford Fulkerson algorithm to work
@@ -505,7 +3129,7 @@ class FlowGraph:
                     Space Complexity : O(1), no extra memory is used here
 
         :Input:
-            None
+            backward : Same as formEdge, push_relabel needs the behind arcs to return flow to the super source
             
         :Instances:
             None
@@ -522,11 +3146,11 @@ class FlowGraph:
         
         #(ii)
         for i in range(1,len(self.sinks)):
-            self.formEdge(self.sinks[i], self.super_sink, 2, False)
-            self.edgesToSuperSink.append(self.vertices[self.sinks[i]].edges[-1])
+            self.formEdge(self.sinks[i], self.super_sink, 2, backward)
+            self.edgesToSuperSink.append(self.last_edge[self.sinks[i]])
         
         #(iii)    
-        self.formEdge(self.sinks[0], self.super_sink, total_people, False)
+        self.formEdge(self.sinks[0], self.super_sink, total_people, backward)
         
         #(iv)
         self.people = total_people
@@ -534,184 +3158,617 @@ class FlowGraph:
     def formEdge (self, depart:int, destination:int, capacity:int, backward:bool = True):
         """
         Function description:
-            formEdge is used to form an edge between two vertices will be added into the FlowGraph and residualNetwork           
+            formEdge is used to form an edge between two vertices, which is stored in residualNetwork only.
+            The flow of the edge is not stored, it is read from residualNetwork as capacity - residual of its front arc.
         
         Approach description (if main function):
-            (i)     Initialise a variable origin which is an edge with flow = 0 and capacity = capacity
-                    Then, append the origin to FlowGraph
-                    Time Complexity : O(1), 
+            (i)     Add the arcs of the edge into residualNetwork, the front arc with residual = capacity
+                    (Residual is at maximum capacity to determine the total flow which can pass through the edge)
+                    and, if backward is True, the behind arc with residual = 0 (No flow is passing through the edge yet)
+                    (Optional as some edges such as super source and super sink cannot be reversed)
+                    Time Complexity : O(1) (Details at ResidualNetwork.add_edge)
                     Space Complexity : O(1)
             
-            (ii)    Initialise a variable residual_front which is an edge with flow = capacity and capacity = capacity
-                    (Flow is at maximum capacity to determine the total flow which can pass through the edge)
-                    Set the starting point of residual_front to origin
-                    Then, append the residual_front to residualNetwork
+            (ii)    The number of the edge is stored as the last edge which leaves depart
                     Time Complexity : O(1)
                     Space Complexity : O(1)
+
+        :Input:
+            depart : the vertex which is the departure point of the edge
+            destination : the vertex which is the arrival point of the edge
+            capacity : the capacity of the edge
+            backward : a boolean value to indicate whether the edge is a backward edge or not
+
+        :Output, return or postcondition:
+            Construct the edge in residualNetwork
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        #(i) Add the arcs of the edge into residualNetwork
+        edge = self.residual_network.add_edge(depart, destination, capacity, backward)
+        
+        #(ii)
+        self.last_edge[depart] = edge
+
+    def feasible(self) -> bool:
+        """
+        Function description:
+            feasible is used to check whether s-t cut is a min cut and provides us with a maximum flow,
+            which is the flow that meets every demand of the circulation network with demand.
             
-            (iii)   If backward is True, initialise a variable residual_behind which is an edge with flow = 0 and capacity = capacity
-                    (Flow is at 0 as currently there is no flow passing through the edge)
-                    Implement some setup to ensure backward edge in residual network has reverse start and end
-                    Then, append the residual_behind to residualNetwork
-                    (Optional as some edges such as super source and super sink cannot be reversed)
+        Approach description (if main function):
+            (i)     Initialise a varaible full_condition with the value which indicates the maximum flow
+                    Initialise a variable outgoingFlow to store the total flow that is leaving the super source
+                    Initialise a variable incomingFlow to store the total flow that is entering the super sink
                     Time Complexity : O(1)
                     Space Complexity : O(1)
+            
+            (ii)    For loop is then used to sum up all the flow that is leaving the super source
+                    Time Complexity : O(N), N as the number of people, worst case where we iterate through all people once
+                    Space Complexity : O(1)
+            
+            (iii)   For loop is then used to sum up all the flow that is entering the super sink
+                    Time Complexity : O(N), N as the number of people, worst case where we iterate through all people once
+                    Space Complexity : O(1)
+            
+            (iv)    Return whether outgoingFlow == incomingFlow and outgoingFlow == full_condition.
+
+        :Input:
+            None
+
+        :Output, return or postcondition:
+            Return True if every person can be allocated, else False
+
+        :Time complexity: O(2N) = O(N), N as the number of people
+
+        :Aux space complexity: O(1)
+        """
+        #(i)
+        full_condition = self.people + 2*math.ceil(self.people/5)
+        outgoingFlow = 0
+        incomingFlow = 0
+        
+        #(ii)
+        network = self.residual_network
+        for arc in range(network.start[self.super_source],network.start[self.super_source + 1]):
+            outgoingFlow += network.capacity[arc] - network.residual[arc]
+        
+        #(iii)
+        for edge in self.edgesToSuperSink:
+            incomingFlow += network.flow(edge)
+        
+        #(iv)
+        return outgoingFlow == incomingFlow and outgoingFlow == full_condition
+
+    def desired_destination(self) -> list[list[int]]:
+        """
+        Function description:
+            desired_destination is used to find which destination each person is allocated to.        
+        
+        Approach description (if main function):
+            (i)     Initialise a variable target which is used to store the value of a list of list which indicates which destination each person is allocated to.
+                    Time Complexity : O(N), N as the number of people, itearting through all people once.
+                    Space Complexity : O(N), N as the number of people, create a list of list to store the value of which destination each person is allocated to.
+            
+            (ii)    Nested for loop is used to iterate through all the arcs in the row of each person in residualNetwork.
+                    The arc which has flow (capacity - residual) of 1 indicates that the person is allocated to the destination which the arc is pointing to. 
+                    Compute the vertex which the arc is pointing to and append it to the list which is stored in target
+                    Time Complexity : O(N^2), N as the number of people, itearting through all people once and all edges that are connected to each person once.
+                    Space Complexity : O(1), no extra memory is used here
+
+        :Input:
+            None
+
+        :Output, return or postcondition:
+            A list of list which indicates which destination each person is allocated to.
+
+        :Time complexity: O(N + N^2) = O(N^2) (N^2 >> N)
+
+        :Aux space complexity: O(N + 1) = O(N)
+        """
+        #(i)
+        target = [[] for i in range(math.ceil(self.people/5))]
+         
+        #(ii)   
+        network = self.residual_network
+        for people in range(self.people):
+            for selection in range(network.start[people],network.start[people + 1]):
+                if network.capacity[selection] - network.residual[selection] == 1:
+                    target[math.floor((network.head[selection]-self.people)/2)].append(people)
+                    
+        return target
+                
+class ResidualNetwork:
+    def __init__(self, vertices_count:int, graph:FlowGraph) -> None:
+        """
+        Function description:
+            init function is used to initialize the ResidualNetwork object which represents the residual network of the FlowGraph.
+            The edges of the residual network (arcs) are stored in compressed sparse row form: the arcs which leave vertex u are
+            self.start[u] to self.start[u+1] - 1, and each arc is an index into int arrays.
+            It is the only store of the edges of FlowGraph: the flow of an arc is capacity - residual, thus, an augmentation only changes
+            the residual of an arc and of its reverse arc.
+
+        :Input:
+            vertices_count : the number of vertices in the residual network
+            graph : Reference which is used to build the residual network
+
+        :Instances:
+            self.source : the super source of the residual network
+            self.sink : the super sink of the residual network
+            self.count : the number of vertices in the residual network
+            self.start : the position of the first arc which leaves each vertex, and the number of arcs at the end (Set by compact)
+            self.tail : the vertex which each arc leaves
+            self.head : the vertex which each arc arrives at
+            self.capacity : the capacity of each arc, the capacity of the edge for a front arc and 0 for a behind arc
+            self.residual : the flow which can still pass through each arc (residual capacity)
+            self.reverse : the arc which goes the other way for each arc, -1 if there is none
+            self.front : the front arc of each edge, in the order the edges are formed
+            self.discovered : a byte for each vertex to indicate whether the vertex has been discovered or not
+            self.previous : the arc which is used to reach each vertex, -1 if there is none
+            self.path : the list of arcs which is used to backtrack from sink to source
+            self.pathAvailable : a boolean value to indicate whether there is a path from source to sink
+            self.level : the number of edges on a shortest path from source to each vertex, -1 if it cannot be reached (Set by level_graph for dinic)
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(V + 2) = O(V), V as the number of vertices in the residual network
+
+        :Aux space complexity: O(V+2) = O(V), V as the number of vertices in the residual network
+        """
+        self.source = graph.super_source #Starts at super source
+        self.sink = graph.super_sink #Ends at super sink
+        self.count = vertices_count + 2
+        self.start = None
+        self.tail = array('i')
+        self.head = array('i')
+        self.capacity = array('q')
+        self.residual = array('q')
+        self.reverse = array('i')
+        self.front = array('i')
+        self.discovered = bytearray(self.count)
+        self.previous = array('i',[-1])*self.count
+        self.path = []
+        self.pathAvailable = False
+        self.level = None
+
+    def add_edge(self, depart:int, destination:int, capacity:int, backward:bool) -> int:
+        """
+        Function description:
+            add_edge is used to add the arcs of an edge of FlowGraph into the residual network, they are placed in rows by compact.
+
+        Approach description (if main function):
+            (i)     The front arc (depart -> arrive) has residual = capacity, the whole capacity can still pass through it.
+
+            (ii)    If backward is True, the behind arc (arrive -> depart) has residual = 0, since no flow passes through the edge yet.
+                    The 2 arcs are the reverse of each other.
+
+        :Input:
+            depart : the vertex which is the departure point of the edge
+            destination : the vertex which is the arrival point of the edge
+            capacity : the capacity of the edge
+            backward : a boolean value to indicate whether the behind arc is added or not
+
+        :Output, return or postcondition:
+            Return the number of the edge, which is used to read its flow with flow
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        #(i)
+        front = len(self.head)
+        self.front.append(front)
+        self.tail.append(depart)
+        self.head.append(destination)
+        self.capacity.append(capacity)
+        self.residual.append(capacity)
+        self.reverse.append(-1)
+
+        #(ii)
+        if backward == True:
+            self.tail.append(destination)
+            self.head.append(depart)
+            self.capacity.append(0)
+            self.residual.append(0)
+            self.reverse.append(front)
+            self.reverse[front] = front + 1
+        return len(self.front) - 1
+
+    def compact(self) -> None:
+        """
+        Function description:
+            compact is used to place the arcs in rows by the vertex they leave, once every edge is formed and before any search.
+
+        Approach description (if main function):
+            (i)     Count the arcs which leave each vertex, self.start is the running total of the counts.
+
+            (ii)    Counting sort: each arc is placed at the next free position of its row. The arcs of a row keep the order they are added in,
+                    which is the order the edges are formed in.
+
+            (iii)   Move every array to the new positions, self.reverse and self.front are positions themselves, thus, they are mapped as well.
+
+        :Input:
+            None
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(V + E), V as the number of vertices, E as the number of arcs
+
+        :Aux space complexity: O(V + E), the arrays are built again
+        """
+        #(i)
+        arcs = len(self.head)
+        start = array('i',[0])*(self.count + 1)
+        for u in self.tail:
+            start[u + 1] += 1
+        for u in range(self.count):
+            start[u + 1] += start[u]
+
+        #(ii)
+        fill = start[:-1]
+        position = array('i',[0])*arcs
+        for arc in range(arcs):
+            u = self.tail[arc]
+            position[arc] = fill[u]
+            fill[u] += 1
+
+        #(iii)
+        tail = array('i',[0])*arcs
+        head = array('i',[0])*arcs
+        capacity = array('q',[0])*arcs
+        residual = array('q',[0])*arcs
+        reverse = array('i',[-1])*arcs
+        for arc in range(arcs):
+            i = position[arc]
+            tail[i] = self.tail[arc]
+            head[i] = self.head[arc]
+            capacity[i] = self.capacity[arc]
+            residual[i] = self.residual[arc]
+            if self.reverse[arc] >= 0:
+                reverse[i] = position[self.reverse[arc]]
+        self.front = array('i',(position[arc] for arc in self.front))
+        self.start,self.tail,self.head,self.capacity,self.residual,self.reverse = start,tail,head,capacity,residual,reverse
+
+    def flow(self, edge:int) -> int:
+        """
+        Function description:
+            flow is used to read the flow of an edge of FlowGraph, which is the capacity - the residual of its front arc,
+            since the front arc loses what the edge gains and the behind arc gives it back.
+
+        :Input:
+            edge : the number of the edge returned by add_edge
+
+        :Output, return or postcondition:
+            Return the flow of the edge
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        arc = self.front[edge]
+        return self.capacity[arc] - self.residual[arc]
+
+    def set_flow(self, edge:int, flow:int) -> None:
+        """
+        Function description:
+            set_flow is used to set the flow of an edge of FlowGraph before any search, so that a solver starts from a flow which is already known.
+            The flows set must meet the capacity of every edge and be conserved at every vertex other than source and sink.
+
+        :Input:
+            edge : the number of the edge returned by add_edge
+            flow : the flow of the edge
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        arc = self.front[edge]
+        self.residual[arc] = self.capacity[arc] - flow
+        if self.reverse[arc] >= 0:
+            self.residual[self.reverse[arc]] = flow
+
+    def bfs(self, source : int, shortest : bool = False) -> None:
+        """
+        Function description:
+            bfs is used to find a valid path from source to sink in the residual network
+
+        Approach description (if main function):
+            Initialise a variable discovered which is a deque to store the vertices that are discovered.
+            Append the source to discovered.
+            While loop is used to iterate through all the vertices that are discovered.
+            (Which will be part of the path from source to sink)
+            Pop the vertex which is at the end of the deque, which makes the search depth first.
+            If shortest is True, pop the vertex which is at the front of the deque instead, which makes the search breadth first,
+            thus, the path found has the fewest edges (Edmonds-Karp).
+            Set the vertex as discovered.
+            If the vertex is the sink or there is a path from source to sink, break the loop.
+            Else, for loop is used to iterate through all the arcs in the row of the vertex.
+            Variable v is used to store the vertex which the arc is pointing to.
+            If the vertex is not discovered and the residual of the arc is greater than 0,
+            set the previous arc of v as the arc, set v as discovered and append v to discovered.
+            If the vertex is the sink, set pathAvailable to True and break the loop.
+
+            Time Complexity : O(V + E), V as the number of vertices, E as the number of edges, worst case where we iterate through all vertices and edges once
+            Space Complexity : O(V), V as the number of vertices, create a deque to store the vertices that are discovered
+
+        :Input:
+            source : the vertex where the search starts
+            shortest : a boolean value to indicate whether the path found should have the fewest edges
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(V + E), V as the number of vertices, E as the number of edges
+
+        :Aux space complexity: O(V), V as the number of vertices
+        """
+        start,head,residual = self.start,self.head,self.residual
+        discovered,previous,sink = self.discovered,self.previous,self.sink
+        queue = deque()
+        queue.append(source)
+        while queue:
+            u = queue.popleft() if shortest else queue.pop()
+            discovered[u] = 1
+            if u == sink or self.pathAvailable:
+                break
+            for arc in range(start[u],start[u + 1]):
+                v = head[arc]
+                if not discovered[v] and residual[arc] > 0:
+                    previous[v] = arc
+                    discovered[v] = 1
+                    queue.append(v)
+                    if v == sink:
+                        self.pathAvailable = True
+                        break
+
+    def level_graph(self) -> bool:
+        """
+        Function description:
+            level_graph is used to compute the level of every vertex in the residual network for dinic, the number of edges on a shortest path from source.
+            Only the arcs which go from one level to the next are used by blocking_flow.
+
+        Approach description (if main function):
+            Breadth first search from source through the arcs which have residual > 0.
+            The level of a vertex is set when it is discovered, one more than the level of the vertex it is discovered from.
 
         :Input:
-            depart : the vertex which is the departure point of the edge
-            destination : the vertex which is the arrival point of the edge
-            capacity : the capacity of the edge
-            backward : a boolean value to indicate whether the edge is a backward edge or not
+            None
 
         :Output, return or postcondition:
-            Construct edges in FlowGraph and residualNetwork
+            Return True if sink can be reached from source, else False
 
-        :Time complexity: O(1)
+        :Time complexity: O(V + E), V as the number of vertices, E as the number of edges
 
-        :Aux space complexity: O(1)
+        :Aux space complexity: O(V), V as the number of vertices
         """
-        #(i) Create edge for FlowGraph
-        origin = Edge(depart, destination, c=capacity )
-        self.vertices[depart].edges.append(origin)
-        
-        #(ii) Create front edge for residualNetwork
-        residual_front = Edge(depart, destination, capacity, capacity)
-        residual_front = residual_front.starting_point(origin)
-        self.residual_network.vertices[depart].edges.append(residual_front)
-        
-        #(iii) Create behind edge for residualNetwork
-        if backward == True:
-            residual_behind = Edge(destination, depart, c=capacity)
-            residual_behind = residual_behind.starting_point(origin)
-            residual_behind = residual_behind.residue_front(residual_front)
-            self.residual_network.vertices[destination].edges.append(residual_behind)
-            self.residual_network.vertices[depart].edges[-1].residue_behind(residual_behind)
+        start,head,residual = self.start,self.head,self.residual
+        level = [-1]*self.count
+        level[self.source] = 0
+        discovered = deque([self.source])
+        while discovered:
+            u = discovered.popleft()
+            for arc in range(start[u],start[u + 1]):
+                if residual[arc] > 0 and level[head[arc]] < 0:
+                    level[head[arc]] = level[u] + 1
+                    discovered.append(head[arc])
+        self.level = level
+        return level[self.sink] >= 0
 
-    def desired_destination(self) -> list[list[int]]:
+    def blocking_flow(self) -> int:
         """
         Function description:
-            desired_destination is used to find which destination each person is allocated to.        
-        
+            blocking_flow is used to augment the flow along paths of the level graph until every path from source to sink in it has an arc with no residual left.
+
         Approach description (if main function):
-            (i)     Initialise a variable target which is used to store the value of a list of list which indicates which destination each person is allocated to.
-                    Time Complexity : O(N), N as the number of people, itearting through all people once.
-                    Space Complexity : O(N), N as the number of people, create a list of list to store the value of which destination each person is allocated to.
-            
-            (ii)    Nested for loop is used to iterate through all the edges that are connected to each person.
-                    The edge which has flow of 1 indicates that the person is allocated to the destination which the edge is pointing to. 
-                    Compute the vertex which the edge is pointing to and append it to the list which is stored in target
-                    Time Complexity : O(N^2), N as the number of people, itearting through all people once and all edges that are connected to each person once.
-                    Space Complexity : O(1), no extra memory is used here
+            (i)     Initialise a variable pointer which stores the next arc to try at each vertex, so that an arc which is found
+                    to lead nowhere is never tried again in this phase.
+
+            (ii)    Walk from source along arcs which have residual > 0 and go to the next level, storing them in self.path.
+                    If a vertex has no such arc left, it is removed from the level graph, and the walk steps back to the previous vertex,
+                    which moves on to its next arc. Once the walk steps back from source, the flow is blocking.
+
+            (iii)   Once the walk reaches sink, the bottleneck along self.path is pushed with update_flow, then the walk starts again at source.
 
         :Input:
             None
 
         :Output, return or postcondition:
-            A list of list which indicates which destination each person is allocated to.
+            Return the number of paths augmented
 
-        :Time complexity: O(N + N^2) = O(N^2) (N^2 >> N)
+        :Time complexity: O(VE), V as the number of vertices, E as the number of edges, each augmentation saturates an arc or steps back
+                          from a vertex and pointer only moves forward
 
-        :Aux space complexity: O(N + 1) = O(N)
+        :Aux space complexity: O(V), V as the number of vertices
         """
         #(i)
-        target = [[] for i in range(math.ceil(self.people/5))]
-         
-        #(ii)   
-        for people in range(self.people):
-            for selection in self.vertices[people].edges:
-                if selection.flow == 1:
-                    target[math.floor((selection.arrive-self.people)/2)].append(selection.depart)
-                    
-        return target
-                
-class ResidualNetwork:
-    def __init__(self, vertices_count:int, graph:FlowGraph) -> None:
+        start,tail,head,residual = self.start,self.tail,self.head,self.residual
+        level = self.level
+        pointer = start[:-1]
+        augmentations = 0
+        while True:
+            #(ii)
+            self.path = []
+            u = self.source
+            while u != self.sink:
+                arc = pointer[u]
+                end = start[u + 1]
+                while arc < end and (residual[arc] <= 0 or level[head[arc]] != level[u] + 1):
+                    arc += 1
+                pointer[u] = arc
+                if arc < end:
+                    self.path.append(arc)
+                    u = head[arc]
+                elif u == self.source:
+                    return augmentations
+                else:
+                    level[u] = -1
+                    u = tail[self.path.pop()]
+                    pointer[u] += 1
+
+            #(iii)
+            self.update_flow(min(residual[arc] for arc in self.path))
+            augmentations += 1
+
+    def global_relabel(self, height:array) -> None:
         """
         Function description:
-            init function is used to initialize the ResidualNetwork object which represents the residual network of the FlowGraph
+            global_relabel is used to set the height of every vertex to its exact distance to sink in the residual network for push_relabel,
+            or n + its distance to source if sink cannot be reached, n as the number of vertices.
+
+        Approach description (if main function):
+            Breadth first search backward from sink, then from source: a vertex u gets the height of v + 1 if the reverse of an arc of v,
+            the arc u -> v, has residual > 0. Source keeps height n.
+            A vertex which reaches neither of them gets height 2n, it has no excess and never receives any.
 
         :Input:
-            vertices_count : the number of vertices in the residual network
-            graph : Reference which is used to build the residual network
-            
-        :Instances:
-            self.source : the super source of the residual network
-            self.sink : the super sink of the residual network
-            self.vertices : the list of vertices in the residual network
-            self.path : the list of edges which is used to backtrack from sink to source
-            self.pathAvailable : a boolean value to indicate whether there is a path from source to sink
+            height : the array of heights which is updated
 
         :Output, return or postcondition:
             None
 
-        :Time complexity: O(V + 2) = O(V), V as the number of vertices in the residual network, iterating through all vertices once
+        :Time complexity: O(V + E), V as the number of vertices, E as the number of edges
 
-        :Aux space complexity: O(V+2) = O(V), V as the number of vertices in the residual network
+        :Aux space complexity: O(V), V as the number of vertices
         """
-        self.source = graph.super_source #Starts at super source
-        self.sink = graph.super_sink #Ends at super sink
-        self.vertices = [None]*(vertices_count + 2)
-        for i in range(vertices_count + 2):
-            self.vertices[i] = Vertex(i)
-        self.path = []
-        self.pathAvailable = False
-    
-    def bfs(self, source : Vertex) -> None:
+        start,head,residual,reverse = self.start,self.head,self.residual,self.reverse
+        n = self.count
+        for u in range(n):
+            height[u] = 2*n
+        height[self.sink] = 0
+        height[self.source] = n
+        for begin in (self.sink,self.source):
+            discovered = deque([begin])
+            while discovered:
+                v = discovered.popleft()
+                for arc in range(start[v],start[v + 1]):
+                    if residual[reverse[arc]] > 0 and height[head[arc]] == 2*n:
+                        height[head[arc]] = height[v] + 1
+                        discovered.append(head[arc])
+
+    def push_relabel(self) -> int:
         """
         Function description:
-            bfs is used to find a valid path from source to sink in the residual network       
-        
+            push_relabel is used to find the maximum flow from source to sink with the highest label push-relabel algorithm.
+            Every arc needs its reverse arc, so that excess can be pushed back towards source.
+
         Approach description (if main function):
-            Initialise a variable discovered which is a deque to store the vertices that are discovered.
-            Append the source to discovered.
-            While loop is used to iterate through all the vertices that are discovered.
-            (Which will be part of the path from source to sink)
-            Pop the vertex which is at the end of the deque.
-            Set the vertex as discovered and visited.
-            If the vertex is the sink or there is a path from source to sink, break the loop.
-            Else, for loop is used to iterate through all the edges that are connected to the vertex.
-            Variable v is used to store the vertex which the edge is pointing to.
-            If the vertex is not visited, not discovered and the flow of the edge is greater than 0,
-            set the previous vertex v as the edge, set v as discovered and append v to discovered.
-            If the vertex is the sink, set pathAvailable to True and break the loop.
-            
-            Time Complexity : O(V + E), V as the number of vertices, E as the number of edges, worst case where we iterate through all vertices and edges once
-            Space Complexity : O(V), V as the number of vertices, create a deque to store the vertices that are discovered
+            (i)     Initialise the height and the excess of every vertex. Every arc which leaves source is saturated,
+                    then the heights are set with global_relabel. The vertices with excess (active) are stored in buckets by height.
+                    Time Complexity : O(V + E)
+                    Space Complexity : O(V)
+
+            (ii)    The active vertex with the highest height is discharged: its excess is pushed along arcs which have residual > 0 and go to a vertex
+                    one lower, starting at current[u], the arc where the last discharge of u stopped.
+                    Pushing along an arc subtracts from its residual and adds to the residual of its reverse arc, the same as update_flow.
+                    A vertex which gets excess is added into the bucket of its height.
+
+            (iii)   If no arc of u is left, u is relabelled to 1 + the lowest height it can push to.
+                    Gap heuristic : if no vertex is left at the old height of u (below n), no vertex above it can reach sink anymore,
+                    thus, they are lifted to n + 1 at once, from where their excess only goes back to source.
+                    u is left out of the scan and lifted on its own, since its new height is only counted once the scan is done.
+                    Global relabel heuristic : after n relabels, the heights are computed again with global_relabel and the buckets are built again.
+
+            (iv)    Once no active vertex is left, the preflow is a flow and the flow into sink is maximum.
+
+            Time Complexity : O(V^2 sqrt(E)) for highest label selection, V as the number of vertices, E as the number of edges
+            Space Complexity : O(V)
 
         :Input:
             None
 
         :Output, return or postcondition:
-            None
+            Return the number of pushes. The residual of every arc is the one of a maximum flow.
 
-        :Time complexity: O(V + E), V as the number of vertices, E as the number of edges
+        :Time complexity: O(V^2 sqrt(E))
 
-        :Aux space complexity: O(V), V as the number of vertices
+        :Aux space complexity: O(V)
         """
-        discovered = deque()
-        discovered.append(source)
-        while discovered:
-            u = discovered.pop()
-            u.discovered = True
-            u.visited = True
-            if u is self.sink or self.pathAvailable:
-                break
-            for edge in u.edges:
-                v = self.vertices[edge.arrive]
-                if v.visited is False:
-                    if v.discovered is False:
-                        if edge.flow > 0:
-                            v.previous = edge
-                            v.discovered = True
-                            discovered.append(v)
-                            if edge.arrive is self.sink:
-                                self.pathAvailable = True
-                                break
-                    
+        #(i)
+        start,head,residual,reverse = self.start,self.head,self.residual,self.reverse
+        n = self.count
+        height = array('i',[0])*n
+        excess = array('q',[0])*n
+        current = start[:-1]
+        for arc in range(start[self.source],start[self.source + 1]):
+            if residual[arc] > 0:
+                excess[head[arc]] += residual[arc]
+                residual[reverse[arc]] += residual[arc]
+                residual[arc] = 0
+        pushes = 0
+        relabels = n
+        highest = -1
+
+        while True:
+            if relabels >= n:
+                self.global_relabel(height)
+                buckets = [[] for i in range(2*n + 2)]
+                count = [0]*(2*n + 2)
+                for u in range(n):
+                    count[height[u]] += 1
+                    current[u] = start[u]
+                    if excess[u] > 0 and u != self.source and u != self.sink and height[u] < 2*n:
+                        buckets[height[u]].append(u)
+                        highest = max(highest,height[u])
+                relabels = 0
+
+            #(iv)
+            while highest >= 0 and not buckets[highest]:
+                highest -= 1
+            if highest < 0:
+                return pushes
+
+            #(ii)
+            u = buckets[highest].pop()
+            end = start[u + 1]
+            while excess[u] > 0:
+                arc = current[u]
+                if arc < end:
+                    v = head[arc]
+                    if residual[arc] > 0 and height[u] == height[v] + 1:
+                        flow = min(excess[u],residual[arc])
+                        residual[arc] -= flow
+                        residual[reverse[arc]] += flow
+                        if excess[v] == 0 and v != self.source and v != self.sink:
+                            buckets[height[v]].append(v)
+                        excess[u] -= flow
+                        excess[v] += flow
+                        pushes += 1
+                    else:
+                        current[u] = arc + 1
+                    continue
+
+                #(iii)
+                old = height[u]
+                count[old] -= 1
+                height[u] = 1 + min(height[head[arc]] for arc in range(start[u],end) if residual[arc] > 0)
+                if count[old] == 0 and old < n:
+                    for w in range(n):
+                        if w != u and old < height[w] < n:
+                            count[height[w]] -= 1
+                            height[w] = n + 1
+                            count[n + 1] += 1
+                            current[w] = start[w]
+                    height[u] = max(height[u],n + 1)
+                count[height[u]] += 1
+                current[u] = start[u]
+                relabels += 1
+                if relabels >= n:
+                    break
+            if excess[u] > 0 and relabels < n:
+                buckets[height[u]].append(u)
+            highest = max(highest,height[u])
+
     def backTrack(self) -> int:
         """
         Function description:
-            backTrack is used to backtrack from sink to source and find the flow that pass through the path from source to sink     
+            backTrack is used to backtrack from sink to source and find the flow that pass through the path from source to sink
 
         :Input:
             None
@@ -721,15 +3778,16 @@ class ResidualNetwork:
 
         :Time complexity: O(V), Worst case where we iterate through all vertices once
 
-        :Aux space complexity: O(E), E as the number of edges, create a list to store the all edges that are connected to the path
+        :Aux space complexity: O(E), E as the number of edges, create a list to store the all arcs that are connected to the path
         """
         self.path = [] #backtrack from sink to source
-        backtrack_initial = self.vertices[self.sink]
+        backtrack_initial = self.sink
         flow = math.inf
-        while backtrack_initial != self.vertices[self.source]:
-            self.path.append(backtrack_initial.previous)
-            flow = min(backtrack_initial.previous.flow, flow)
-            backtrack_initial = self.vertices[backtrack_initial.previous.depart]
+        while backtrack_initial != self.source:
+            arc = self.previous[backtrack_initial]
+            self.path.append(arc)
+            flow = min(self.residual[arc], flow)
+            backtrack_initial = self.tail[arc]
         return flow
 
     def reset_state(self) -> None:
@@ -739,66 +3797,50 @@ class ResidualNetwork:
             Reason : To enable bfs to be used multiple times until there is no path from source to sink in the residual network
             It also set pathAvailable to False to indicate that there is no path from source to sink in the residual network
             Reason : This helps to find a new path when bfs is reused
-            
+
         Approach description (if main function):
-            First, a for loop is used to reset vertices property discovered,visited,previous.
-            Then, set pathAvailable to False 
-        
+            First, the arrays discovered and previous are created again.
+            Then, set pathAvailable to False
+
         :Input:
             None
-        
+
         :Output, return or postcondition:
             None
-            
-        :Time complexity: O(V) All vertices are visited once 
-        :Aux space complexity: O(1) No memory is used here
+
+        :Time complexity: O(V) All vertices are visited once
+        :Aux space complexity: O(V) The arrays are created again
         """
-        for i in self.vertices:
-            i.visited = False
-            i.discovered = False
-            i.previous = None
+        self.discovered = bytearray(self.count)
+        self.previous = array('i',[-1])*self.count
         self.pathAvailable = False
 
-    
+
     def update_flow(self, flow:int) -> None:
         """
         Function description:
-            Update the flow of edges in the path from source to sink in the residual network and FlowGraph
-        
+            Update the flow of arcs in the path from source to sink in the residual network
+
         Approach description (if main function):
-            A for loop is used to iterate through all the edges in the path.
-            First, update the flow of the edge.
-            Then, check whether the edge is a front edge or a behind edge.
-            If the edge is a behind edge, 
-            origin adge and the behind edge is being added with flow.
-            If the edge is a front edge,
-            origin edge is being added with flow and the front edge is being subtracted with flow.
-            Else, origin edge is being added with flow.
-            
+            A for loop is used to iterate through all the arcs in the path.
+            The residual of the arc is subtracted with flow, and the residual of its reverse arc, if there is one, is added with flow.
+            These are the only numbers changed, the flow of the edges in FlowGraph is read from them.
+
         :Input:
             supply : the bottleneck along the path
 
         :Output, return or postcondition:
             None
 
-        :Time complexity: O(E), E as the number of edges in the path, iterating through all edges in the path and update the flow of the edge
-        
+        :Time complexity: O(E), E as the number of edges in the path, iterating through all arcs in the path and update the residual of the arc
+
         :Aux space complexity: O(1), no extra memory is used here
         """
-        for edge in self.path :
-            #update the flow of the flowNetwork
-            edge.flow_augment((-1)*flow)
-            #update the flow of the residualNetwork
-            if edge.behind != None:
-                edge.origin.flow_augment(flow)
-                edge.behind.flow_augment(flow)
-                
-            elif edge.front != None:
-                edge.origin.flow_augment((-1)*flow)
-                edge.front.flow_augment(flow)
-            
-            else:
-                edge.origin.flow_augment(flow)
+        residual,reverse = self.residual,self.reverse
+        for arc in self.path :
+            residual[arc] -= flow
+            if reverse[arc] >= 0:
+                residual[reverse[arc]] += flow
 
 def weekend_gateaway (preferences:list[list[int]],licenses:list[int]) -> tuple[list[tuple[int,int,int]] , list[int] , list[int]]:
     """
@@ -925,7 +3967,7 @@ def weekend_gateaway (preferences:list[list[int]],licenses:list[int]) -> tuple[l
     #(vii)
     return (gateaway,begin,terminate)
 
-def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int,int]]) -> FlowGraph:
+def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int,int]], solver:str = "dfs", flows:list[tuple[int,int]] = None) -> FlowGraph:
     """
     Function description:
         ford_fulkerson is used to find the maximum flow by finding all path available from source to sink  
@@ -944,11 +3986,13 @@ def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int
                 Time Complexity : O(E), E as the number of edges, iterating through all edges once
                 Space Complexity : O(1), no extra memory is used here
         
-        (iv)    Add super source and super sink into FlowGraph
-                Time Complexity : O(2V) (Details at superSource and superSink)
-                Space Complexity : O(2V) (Details at superSource and superSink)
+        (iv)    Add super source and super sink into FlowGraph, then place the arcs of residualNetwork in rows with compact
+                If flows is given, the flow of those edges is set with set_flow, thus, the paths below only augment what is missing
+                Time Complexity : O(2V) (Details at superSource and superSink) + O(V + E) (Details at compact)
+                Space Complexity : O(2V) (Details at superSource and superSink) + O(V + E) (Details at compact)
         
         (v)     Run bfs in residualNetwork to find a path from super source to super sink
+                If solver is "edmonds_karp", bfs takes vertices from the front of the deque, thus, the path found is a shortest one
                 Time Complexity : O(V + E), V as the number of vertices, E as the number of edges
                 Space Complexity : O(V), V as the number of vertices, create a deque to store the vertices that are discovered
         
@@ -959,7 +4003,14 @@ def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int
                 Once there is no path left, return the current FlowGraph
                 Time Complexity : O(M)*(O(V) + O(E) + O(V) + O(V+E)) = O(M*(V+E)) = O(MV + ME) = O(ME), E >> V, 
                                     M as the number of times bfs is runned, V as the number of vertices, E as the number of edges
+                                    M is at most the max flow for "dfs", and O(VE) for "edmonds_karp" since the length of the shortest path never decreases
                 Space Complexity : O(M)*(O(1) + O(E) + O(V)) = O(E), V as the number of vertices, created when bfs is runned
+                
+                If solver is "dinic", (v) and (vi) are replaced by phases instead: level_graph computes the level of every vertex,
+                then blocking_flow augments along the level graph until no path is left in it. Each phase makes the shortest path longer, 
+                thus, there are at most V phases.
+                Time Complexity : O(V)*(O(V+E) + O(VE)) = O(V^2 E)
+                Space Complexity : O(V)
         
         (vii)   Check whether s-t cut is a min cut and provides us with a maximum flow. O(N) O(1)
                 If true, return a list of list which indicates which destination each person is allocated to.
@@ -971,15 +4022,23 @@ def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int
         begin : the list of vertices which are the sources in the circulation network with demand
         terminate : the list of vertices which are the sinks in the circulation network with demand
         edge : the list of edges in the circulation network with demand   
+        solver : "dfs" (the default), "edmonds_karp" or "dinic", the way augmenting paths are found
+        flows : a list of (number of edge, flow) which is a valid flow to start from, edges are numbered in the order they are formed:
+                edge in order, then the edges of superSource and superSink
 
     :Output, return or postcondition:
         Return the FlowGraph when there is no more path, checking feasibility (whether the s-t cut is a min cut and max flow)
         and returning the desired location each people allocated to will be carried on later at allocate function. 
+        graph.augmentations is the number of paths augmented.
+        ValueError is raised if solver is not one of the above.
 
     :Time complexity: O(E + V + E + 2V + (E+V) + ME) = O(4E + 4V + ME) = O(ME), E >> V
 
     :Aux space complexity: O(1 + V + 1 + 2V + V + E) = O(4V + E) = O(V + E), E >> N, V >> N
     """
+    if solver not in ("dfs","edmonds_karp","dinic"):
+        raise ValueError(f"unknown solver {solver!r}")
+    
     #(i)
     currentMax = 0
     for i in edge:
@@ -998,20 +4057,83 @@ def ford_fulkerson(begin:list[int], terminate:list[int], edge:list[tuple[int,int
     #(iv)
     graph.superSource()
     graph.superSink()
+    graph.residual_network.compact()
+    if flows:
+        for number,flow in flows:
+            graph.residual_network.set_flow(number,flow)
+    
+    if solver == "dinic":
+        while graph.residual_network.level_graph():
+            graph.augmentations += graph.residual_network.blocking_flow()
+        return graph
     
     #(v)
-    graph.residual_network.bfs(graph.residual_network.vertices[graph.super_source])
+    shortest = solver == "edmonds_karp"
+    graph.residual_network.bfs(graph.super_source,shortest)
     
     #(vi)
     while graph.residual_network.pathAvailable:
         flow = graph.residual_network.backTrack()
         graph.residual_network.update_flow(flow)
+        graph.augmentations += 1
         graph.residual_network.reset_state()
-        graph.residual_network.bfs(graph.residual_network.vertices[graph.super_source])
+        graph.residual_network.bfs(graph.super_source,shortest)
+        
+    return graph
+
+def push_relabel(begin:list[int], terminate:list[int], edge:list[tuple[int,int,int]], flows:list[tuple[int,int]] = None) -> FlowGraph:
+    """
+    Function description:
+        push_relabel is used to find the maximum flow of the same network as ford_fulkerson with the highest label push-relabel algorithm,
+        which pushes flow one edge at a time instead of searching the whole graph for each path.
+                
+    Approach description (if main function):
+        (i)     Build the FlowGraph the same way as ford_fulkerson, the edges from super source and to super sink also get behind arcs,
+                since excess which cannot reach super sink has to be pushed back to super source.
+                If flows is given, the flow of those edges is set with set_flow.
+                Time Complexity : O(V + E)
+                Space Complexity : O(V + E)
         
+        (ii)    Run push_relabel in residualNetwork.
+                Time Complexity : O(V^2 sqrt(E)) (Details at ResidualNetwork.push_relabel)
+                Space Complexity : O(V)
+
+    :Input:
+        begin : the list of vertices which are the sources in the circulation network with demand
+        terminate : the list of vertices which are the sinks in the circulation network with demand
+        edge : the list of edges in the circulation network with demand   
+        flows : Same as ford_fulkerson
+
+    :Output, return or postcondition:
+        Return the FlowGraph with a maximum flow, the same as ford_fulkerson, thus, it can be checked and read by allocate.
+        graph.augmentations is the number of pushes.
+
+    :Time complexity: O(V^2 sqrt(E))
+
+    :Aux space complexity: O(V + E)
+    """
+    #(i)
+    currentMax = 0
+    for i in edge:
+        if i[0] > currentMax:
+            currentMax = i[0]
+        if i[1] > currentMax:
+            currentMax = i[1]
+    graph = FlowGraph(begin,terminate,currentMax+1)
+    for i in edge:
+        graph.formEdge(i[0],i[1],i[2])
+    graph.superSource(True)
+    graph.superSink(True)
+    graph.residual_network.compact()
+    if flows:
+        for number,flow in flows:
+            graph.residual_network.set_flow(number,flow)
+    
+    #(ii)
+    graph.augmentations = graph.residual_network.push_relabel()
     return graph
 
-def allocate(preferences:list[list[int]],licenses:list[int]) -> list[list[int]] or None:
+def allocate(preferences:list[list[int]],licenses:list[int],solver:str = "dfs") -> list[list[int]] or None:
     """
     Function description:
         allocate function is used to allocate every people to their desired destination based on the preferences list and licenses list the question provided 
@@ -1022,31 +4144,17 @@ def allocate(preferences:list[list[int]],licenses:list[int]) -> list[list[int]]
                 Time Complexity : O(N^2), N as the number of people (Details at weekend_gateaway function)
                 Space Complexity : O(N^2), N as the number of people (Details at weekend_gateaway function)
         
-        (ii)    Initialise variable graph with the value of ford_fulkerson function which is used to find the maximum flow.
+        (ii)    Initialise variable graph with the value of ford_fulkerson function which is used to find the maximum flow, with the solver given.
+                If solver is "push_relabel", push_relabel function is used instead.
                 Time Complexity : O(ME), M as the number of bfs runned, E as the number of edges (Details at ford_fulkerson function)
                 At here, M is actually  N + 2*math.ceil(N/5), E is actually N^2, thus Time Complexity will be updated to O(N^3)
                 Space Complexity : O(V +E), V as the number of vertices, E as the number of edges (Details at ford_fulkerson function)
         
-        (iii)   Check whether s-t cut is a min cut and provides us with a maximum flow.
-                (i)     Initialise a varaible full_condition with the value which indicates the maximum flow
-                        Initialise a variable outgoingFlow to store the total flow that is leaving the super source
-                        Initialise a variable incomingFlow to store the total flow that is entering the super sink
-                        Time Complexity : O(1)
-                        Space Complexity : O(1)
-            
-                (ii)   For loop is then used to sum up all the flow that is leaving the super source
-                        Time Complexity : O(N), N as the number of people, worst case where we iterate through all people once
-                        Space Complexity : O(1)
-            
-                (iii)   For loop is then used to sum up all the flow that is entering the super sink
-                        Time Complexity : O(N), N as the number of people, worst case where we iterate through all people once
-                        Space Complexity : O(1)
-        
-                Overall Time Complexity : O(2N) = O(N), N as the number of people 
-                Overall Space Complexity : O(3) = O(1), no extra memory is used here
+        (iii)   Check whether s-t cut is a min cut and provides us with a maximum flow with graph.feasible.
+                Time Complexity : O(N), N as the number of people (Details at FlowGraph.feasible)
+                Space Complexity : O(1)
         
-        (iv)    If outgoingFlow == incomingFlow and outgoingFlow == full_condition,
-                return the desired destination each people allocated to.
+        (iv)    If the flow is feasible, return the desired destination each people allocated to.
                 Else, return None
                 Time Complexity : O(N^2), N as the number of people (Details at desired_destination)
                 Space Complexity : O(N), N as the number of people (Details at desired_destination)
@@ -1054,6 +4162,7 @@ def allocate(preferences:list[list[int]],licenses:list[int]) -> list[list[int]]
     :Input:
         preferences: The list of preferences of which destination to go for each people
         licenses: The list of licenses indicating which people owns a license
+        solver: The solver used by ford_fulkerson, "dfs" (the default), "edmonds_karp" or "dinic", or "push_relabel"
 
     :Output, return or postcondition:
         Return a list of list which indicates which destination each person is allocated to or None if there is no solution.
@@ -1066,23 +4175,289 @@ def allocate(preferences:list[list[int]],licenses:list[int]) -> list[list[int]]
     information = weekend_gateaway(preferences,licenses)
     
     #(ii)
-    graph = ford_fulkerson(information[1],information[2],information[0])
-    
-    #(iii)
-    ##(iii.i)
-    full_condition = graph.people + 2*math.ceil(graph.people/5)
-    outgoingFlow = 0
-    incomingFlow = 0
-    
-    ##(iii.ii)
-    for edge in graph.vertices[graph.super_source].edges:
-        outgoingFlow += edge.flow
-    
-    ##(iii.iii)
-    for edge in graph.edgesToSuperSink:
-        incomingFlow += edge.flow
+    if solver == "push_relabel":
+        graph = push_relabel(information[1],information[2],information[0])
+    else:
+        graph = ford_fulkerson(information[1],information[2],information[0],solver)
     
-    #(iv)
-    if outgoingFlow == incomingFlow and outgoingFlow == full_condition:
+    #(iii) - (iv)
+    if graph.feasible():
         return graph.desired_destination()
-    return None
\ No newline at end of file
+    return None
+
+class Allocator:
+    def __init__(self, preferences:list[list[int]], licenses:list[int], solver:str = "dfs") -> None:
+        """
+        Function description:
+            init function is used to initialise an Allocator, which allocates the same people as allocate again and again while they change.
+            Each change only drops the allocation of the people it affects. The next allocate is a warm-started rebuild: the network
+            is built again from scratch, then the solver starts from the flow of everyone else and only augments what is missing,
+            instead of finding the whole flow again.
+
+        :Input:
+            preferences : Same as allocate
+            licenses : Same as allocate
+            solver : Same as allocate
+
+        :Instances:
+            self.preferences : The list of preferences of each person, copied
+            self.licenses : A list of boolean values to indicate whether each person owns a license
+            self.solver : The solver used by allocate
+            self.assignment : The destination each person is allocated to by the last allocate, -1 if there is none
+            self.augmentations : The number of paths augmented (pushes for "push_relabel") by the last allocate
+
+        :Output, return or postcondition:
+            ValueError is raised if solver is not one of the solvers of allocate.
+
+        :Time complexity: O(N + P), N as the number of people, P as the total number of preferences
+
+        :Aux space complexity: O(N + P)
+        """
+        if solver not in ("dfs","edmonds_karp","dinic","push_relabel"):
+            raise ValueError(f"unknown solver {solver!r}")
+        self.preferences = [list(preference) for preference in preferences]
+        self.licenses = [False]*len(preferences)
+        for i in licenses:
+            self.licenses[i] = True
+        self.solver = solver
+        self.assignment = [-1]*len(preferences)
+        self.augmentations = 0
+
+    def add_person(self, preferences:list[int], license:bool = False) -> int:
+        """
+        Function description:
+            add_person is used to add a person, who is not allocated yet.
+
+        :Input:
+            preferences : The list of preferences of the person
+            license : A boolean value to indicate whether the person owns a license
+
+        :Output, return or postcondition:
+            Return the number of the person, the number of people before it is added.
+            ValueError is raised if a preference is not one of the ceil((N + 1)/5) destinations, N as the number of people before it is added.
+
+        :Time complexity: O(P), P as the number of preferences of the person
+
+        :Aux space complexity: O(P)
+        """
+        destinations = math.ceil((len(self.preferences) + 1)/5)
+        for destination in preferences:
+            if not 0 <= destination < destinations:
+                raise ValueError(f"destination {destination} does not exist, there are {destinations} destinations")
+        self.preferences.append(list(preferences))
+        self.licenses.append(license)
+        self.assignment.append(-1)
+        return len(self.preferences) - 1
+
+    def remove_person(self, person:int) -> None:
+        """
+        Function description:
+            remove_person is used to remove a person, the people after it are numbered one lower, the same as removing it from the preferences list.
+            There are ceil(N/5) destinations for N people, thus, a removal can also remove the last destination.
+            The preferences of the destinations which no longer exist are dropped, and so is the allocation of the people at them.
+            A dropped preference does not come back if the destination exists again after add_person.
+
+        :Input:
+            person : The number of the person
+
+        :Output, return or postcondition:
+            None, a person whose only preferences are dropped is left with none, thus, the next allocate returns None, the same as allocate.
+
+        :Time complexity: O(N + P), N as the number of people, P as the total number of preferences
+
+        :Aux space complexity: O(1)
+        """
+        del self.preferences[person]
+        del self.licenses[person]
+        del self.assignment[person]
+        destinations = math.ceil(len(self.preferences)/5)
+        for other in range(len(self.preferences)):
+            if any(destination >= destinations for destination in self.preferences[other]):
+                self.preferences[other] = [destination for destination in self.preferences[other] if destination < destinations]
+            if self.assignment[other] >= destinations:
+                self.assignment[other] = -1
+
+    def add_preference(self, person:int, destination:int) -> None:
+        """
+        Function description:
+            add_preference is used to add a destination to the preferences of a person, the allocation of nobody is dropped.
+
+        :Input:
+            person : The number of the person
+            destination : The destination
+
+        :Output, return or postcondition:
+            None, ValueError is raised if destination is not one of the ceil(N/5) destinations, N as the number of people.
+
+        :Time complexity: O(P), P as the number of preferences of the person
+
+        :Aux space complexity: O(1)
+        """
+        destinations = math.ceil(len(self.preferences)/5)
+        if not 0 <= destination < destinations:
+            raise ValueError(f"destination {destination} does not exist, there are {destinations} destinations")
+        if destination not in self.preferences[person]:
+            self.preferences[person].append(destination)
+
+    def remove_preference(self, person:int, destination:int) -> None:
+        """
+        Function description:
+            remove_preference is used to remove a destination from the preferences of a person, the allocation of the person is dropped if it is that destination.
+
+        :Input:
+            person : The number of the person
+            destination : The destination
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(P), P as the number of preferences of the person
+
+        :Aux space complexity: O(1)
+        """
+        self.preferences[person].remove(destination)
+        if self.assignment[person] == destination:
+            self.assignment[person] = -1
+
+    def toggle_license(self, person:int) -> None:
+        """
+        Function description:
+            toggle_license is used to give a license to a person who does not own one, or take it from a person who owns one.
+            The allocation of the person is dropped, since the person goes to the destination through the other vertex.
+
+        :Input:
+            person : The number of the person
+
+        :Output, return or postcondition:
+            None
+
+        :Time complexity: O(1)
+
+        :Aux space complexity: O(1)
+        """
+        self.licenses[person] = not self.licenses[person]
+        self.assignment[person] = -1
+
+    def seed(self, edge:list[tuple[int,int,int]]) -> list[tuple[int,int]]:
+        """
+        Function description:
+            seed is used to build the flow of the people who keep their allocation, in the network built by weekend_gateaway.
+
+        Approach description (if main function):
+            (i)     Locate the edges by the order weekend_gateaway forms them: for each person, the edge from initial_source then one edge per preference;
+                    then 3 edges per destination, license vertex -> destination, no license vertex -> destination, destination -> initial_sink;
+                    then initial_sink -> initial_source. superSource forms super source -> each destination then super source -> initial_source,
+                    superSink forms each license vertex -> super sink then initial_sink -> super sink.
+
+            (ii)    A person keeps the destination d of self.assignment if d is still a destination and one of the preferences of the person,
+                    the car of d has less than 5 people, and, if the person does not own a license, less than 3 people without a license.
+
+            (iii)   The flow of the people kept, with l drivers and u others at d: 1 along initial_source -> person -> license or no license vertex,
+                    max(l-2,0) from license vertex and u from no license vertex to d, min(l,2) from super source to d and from license vertex to super sink,
+                    l+u from d to initial_sink, and all the people kept from super source to initial_source and from initial_sink to super sink.
+                    The flow is conserved at every vertex, thus, it is a valid flow to start from.
+
+        :Input:
+            edge : The list of edges built by weekend_gateaway with self.preferences and self.licenses
+
+        :Output, return or postcondition:
+            Return a list of (number of edge, flow) for ford_fulkerson
+
+        :Time complexity: O(N + P), N as the number of people, P as the total number of preferences
+
+        :Aux space complexity: O(N + D), D as the number of destinations
+        """
+        #(i)
+        total_people = len(self.preferences)
+        destinations = math.ceil(total_people/5)
+        gateaway = len(edge) - 1 - 3*destinations
+        superSource = len(edge)
+        superSink = superSource + destinations + 1
+
+        #(ii)
+        drivers = [0]*destinations
+        others = [0]*destinations
+        flows = []
+        number = 0
+        kept = 0
+        for person in range(total_people):
+            d = self.assignment[person]
+            if 0 <= d < destinations and d in self.preferences[person] and drivers[d] + others[d] < 5 and (self.licenses[person] or others[d] < 3):
+                if self.licenses[person]:
+                    drivers[d] += 1
+                else:
+                    others[d] += 1
+                flows.append((number,1))
+                flows.append((number + 1 + self.preferences[person].index(d),1))
+                kept += 1
+            else:
+                self.assignment[person] = -1
+            number += 1 + len(self.preferences[person])
+
+        #(iii)
+        for d in range(destinations):
+            flows.append((gateaway + 3*d,max(drivers[d] - 2,0)))
+            flows.append((gateaway + 3*d + 1,others[d]))
+            flows.append((gateaway + 3*d + 2,drivers[d] + others[d]))
+            flows.append((superSource + d,min(drivers[d],2)))
+            flows.append((superSink + d,min(drivers[d],2)))
+        flows.append((superSource + destinations,kept))
+        flows.append((superSink + destinations,kept))
+        return flows
+
+    def allocate(self) -> list[list[int]] or None:
+        """
+        Function description:
+            allocate function is used to allocate every people to their desired destination after the changes, the same as allocate.
+
+        Approach description (if main function):
+            (i)     Build the circulation network with demand with weekend_gateaway. The network and the arrays of its residual network are
+                    built again from scratch on every call, since a change in the number of people can renumber every vertex and the arrays
+                    cannot take inserts, thus, nothing but the flow is carried over from the last allocate and this cost is paid every time.
+                    Time Complexity : O(V + E)
+                    Space Complexity : O(V + E)
+
+            (ii)    Build the flow of the people who keep their allocation with seed, then run the solver from that flow.
+                    Time Complexity : O(KE) for "dfs", K as the number of paths augmented, which is about the number of people dropped or added
+                    Space Complexity : O(V + E)
+
+            (iii)   Store the destination of every person who is allocated, even if not all of them are, so that the next allocate starts from it.
+                    A person who was kept can still be moved or dropped by a path which goes back along its edges, thus, every person is read again.
+                    Time Complexity : O(V + E)
+                    Space Complexity : O(N)
+
+            (iv)    If the flow is feasible, return the desired destination each people allocated to, else return None.
+                    A maximum flow is found from any valid flow, thus, the result is None exactly when allocate returns None.
+
+        :Input:
+            None
+
+        :Output, return or postcondition:
+            Return a list of list which indicates which destination each person is allocated to or None if there is no solution.
+
+        :Time complexity: O(V + E + KE), K as the number of paths augmented, the O(V + E) rebuild is paid even if nothing has changed
+
+        :Aux space complexity: O(V + E)
+        """
+        #(i)
+        information = weekend_gateaway(self.preferences,[person for person in range(len(self.licenses)) if self.licenses[person]])
+
+        #(ii)
+        flows = self.seed(information[0])
+        if self.solver == "push_relabel":
+            graph = push_relabel(information[1],information[2],information[0],flows)
+        else:
+            graph = ford_fulkerson(information[1],information[2],information[0],self.solver,flows)
+        self.augmentations = graph.augmentations
+
+        #(iii)
+        target = graph.desired_destination()
+        self.assignment = [-1]*len(self.preferences)
+        for d in range(len(target)):
+            for person in target[d]:
+                self.assignment[person] = d
+
+        #(iv)
+        if graph.feasible():
+            return target
+        return None
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Build time and memory of Trie against CompactTrie on the same random dictionary, after checking that both answer the same.
+
+    python bench/compact_trie.py [--words 100000]
+
+The build is timed without tracing, then done again under tracemalloc, which slows allocation down. The memory is what tracemalloc
+still traces once that build is done, thus, the memory held by the trie.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment2 import Trie, CompactTrie
+from words import random_dictionary, random_prefixes
+
+
+def measure(build, dictionary:list[list[str,str,int]]) -> tuple[float,int]:
+    """
+    Function description:
+        measure function is used to build a trie from the dictionary twice, once timed and once traced.
+
+    :Output, return or postcondition:
+        The build time in seconds and the bytes held by the trie.
+    """
+    start = time.perf_counter()
+    trie = build(dictionary)
+    elapsed = time.perf_counter() - start
+    del trie
+    tracemalloc.start()
+    trie = build(dictionary)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del trie
+    return elapsed,held
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words",type=int,default=100000)
+    arguments = parser.parse_args()
+
+    dictionary = random_dictionary(arguments.words,seed=9)
+    trie,compact = Trie(dictionary),CompactTrie(dictionary)
+    for prefix in random_prefixes(dictionary,5000):
+        assert trie.prefix_search(prefix) == compact.prefix_search(prefix),prefix
+    del trie,compact
+
+    print(f"{arguments.words} words, {sum(len(data[0]) for data in dictionary)} characters")
+    for build in (Trie,CompactTrie):
+        elapsed,held = measure(build,dictionary)
+        print(f"{build.__name__:12} build {elapsed:5.2f}s  memory {held/1e6:6.1f} MB",flush=True)
@@ -0,0 +1,56 @@
+"""
+Augmenting paths and wall time of the ford_fulkerson solvers (and push_relabel) on random allocation instances.
+
+    python bench/flow_solvers.py [--sizes 500 1000] [--solvers dfs edmonds_karp dinic push_relabel]
+
+Each instance has N people, N // 2 of them with a license, and ceil(N / 5) destinations. Every person prefers all destinations,
+unless --preferences is given.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment2 import weekend_gateaway, ford_fulkerson, push_relabel
+
+SOLVERS = ("dfs","edmonds_karp","dinic","push_relabel")
+
+
+def instance(people:int, preferences:int = None, seed:int = 11) -> tuple[list[list[int]],list[int]]:
+    """
+    Function description:
+        instance function is used to build random preferences and licenses for the number of people given.
+
+    :Output, return or postcondition:
+        The preferences and the licenses, in the form taken by allocate.
+    """
+    generator = random.Random(seed)
+    destinations = -(-people//5)
+    chosen = destinations if preferences is None else min(preferences,destinations)
+    return [generator.sample(range(destinations),chosen) for _ in range(people)],generator.sample(range(people),people//2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes",type=int,nargs="+",default=[500,1000])
+    parser.add_argument("--preferences",type=int,default=None)
+    parser.add_argument("--solvers",nargs="+",choices=SOLVERS,default=list(SOLVERS))
+    arguments = parser.parse_args()
+
+    for people in arguments.sizes:
+        preferences,licenses = instance(people,arguments.preferences)
+        edge,begin,terminate = weekend_gateaway(preferences,licenses)
+        for solver in arguments.solvers:
+            start = time.perf_counter()
+            if solver == "push_relabel":
+                graph = push_relabel(begin,terminate,edge)
+            else:
+                graph = ford_fulkerson(begin,terminate,edge,solver)
+            elapsed = time.perf_counter() - start
+            flow = sum(graph.residual_network.flow(number) for number in graph.edgesToSuperSink)
+            print(f"N={people:<6} edges={len(edge):<8} {solver:13} augmentations={graph.augmentations:<7} flow={flow:<7} "
+                  f"feasible={flow == people + 2*math.ceil(people/5)!s:5} {elapsed:7.2f}s",flush=True)
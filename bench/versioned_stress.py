@@ -0,0 +1,94 @@
+"""
+Read throughput of prefix_search while one thread inserts new words, for a Trie behind a global lock and for VersionedTrie,
+whose readers take no lock.
+
+    python bench/versioned_stress.py [--words 200000] [--seconds 5] [--readers 1 4]
+
+Every result is checked to start with its prefix, a reader which saw a half written node would be counted as bad.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment2 import Trie, VersionedTrie
+from words import random_dictionary, random_prefixes
+
+
+def run(trie, prefixes:list[str], extra:list[list[str,str,int]], readers:int, writing:bool, seconds:float, lock = None) -> tuple[float,float,int]:
+    """
+    Function description:
+        run function is used to run readers threads searching random prefixes, and one writer inserting the extra words if writing is True,
+        for the given number of seconds.
+
+    :Output, return or postcondition:
+        The reads per second of all readers together, the writes per second and the number of bad results.
+    """
+    stop = threading.Event()
+    reads = [0]*readers
+    bad = [0]*readers
+    writes = [0]
+
+    def reader(number):
+        generator = random.Random(number)
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                prefix = prefixes[generator.randrange(len(prefixes))]
+                if lock is not None:
+                    with lock:
+                        result = trie.prefix_search(prefix)
+                else:
+                    result = trie.prefix_search(prefix)
+                if result[0] is not None and not result[0].startswith(prefix):
+                    bad[number] += 1
+                count += 1
+        reads[number] = count
+
+    def writer():
+        for data in extra:
+            if stop.is_set():
+                break
+            if lock is not None:
+                with lock:
+                    trie.insert(data[0],data)
+            else:
+                trie.insert(data[0],data)
+            writes[0] += 1
+
+    threads = [threading.Thread(target=reader,args=(number,)) for number in range(readers)]
+    if writing:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads)/seconds,writes[0]/seconds,sum(bad)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words",type=int,default=200000)
+    parser.add_argument("--seconds",type=float,default=5.0)
+    parser.add_argument("--readers",type=int,nargs="+",default=[1,4])
+    arguments = parser.parse_args()
+
+    base = random_dictionary(arguments.words,seed=7)
+    # The words written end with "x" and are at most 11 characters long, thus, none of them is already in base.
+    extra = [[word + "x",definition,frequency] for word,definition,frequency in random_dictionary(arguments.words*3//10,seed=9,maxlen=11)]
+    prefixes = random_prefixes(base,20000)
+
+    for readers in arguments.readers:
+        for name,build,lock in (("Trie + global lock",Trie,threading.Lock()),("VersionedTrie",VersionedTrie,None)):
+            for writing in (False,True):
+                trie = build(base)
+                gc.collect()
+                reads,writes,bad = run(trie,prefixes,extra,readers,writing,arguments.seconds,lock)
+                print(f"{name:18} readers={readers} writer={writing!s:5} reads/s={reads:9.0f} writes/s={writes:7.0f} bad={bad}",flush=True)
@@ -0,0 +1,56 @@
+"""
+Random dictionaries and prefixes shared by the benchmarks in this directory.
+"""
+import random
+import string
+
+
+def random_dictionary(n:int, seed:int = 1, maxlen:int = 12, max_frequency:int = 50) -> list[list[str,str,int]]:
+    """
+    Function description:
+        random_dictionary function is used to build n distinct random words in the [word, definition, frequency] form taken by Trie.
+        Half of the characters are drawn from a to h only, thus, the words share long prefixes like a real dictionary.
+
+    :Input:
+        n : The number of words.
+        seed : The seed of the random generator.
+        maxlen : The longest word.
+        max_frequency : The highest frequency.
+
+    :Output, return or postcondition:
+        A list of n [word, definition, frequency] lists.
+    """
+    generator = random.Random(seed)
+    dictionary = []
+    seen = set()
+    while len(dictionary) < n:
+        word = "".join(generator.choice(string.ascii_lowercase[:8] if generator.random() < 0.5 else string.ascii_lowercase)
+                       for _ in range(generator.randint(1,maxlen)))
+        if word in seen:
+            continue
+        seen.add(word)
+        dictionary.append([word,"def of " + word,generator.randint(1,max_frequency)])
+    return dictionary
+
+
+def random_prefixes(dictionary:list[list[str,str,int]], n:int, seed:int = 2) -> list[str]:
+    """
+    Function description:
+        random_prefixes function is used to build 2n + 1 prefixes to search: the empty prefix, n prefixes of words in the dictionary
+        and n random strings, most of which are not in the dictionary.
+
+    :Input:
+        dictionary : The dictionary the prefixes are taken from.
+        n : The number of prefixes of each kind.
+        seed : The seed of the random generator.
+
+    :Output, return or postcondition:
+        A list of 2n + 1 prefixes.
+    """
+    generator = random.Random(seed)
+    prefixes = [""]
+    for _ in range(n):
+        word = generator.choice(dictionary)[0]
+        prefixes.append(word[:generator.randint(1,len(word))])
+        prefixes.append("".join(generator.choice("abcdefghij") for _ in range(generator.randint(1,4))))
+    return prefixes
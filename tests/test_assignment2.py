@@ -0,0 +1,756 @@
+"""
+Brute force oracle checks: every structure is driven through random operations and compared with a plain dictionary or a fresh solve.
+
+    python -m pytest -q tests
+"""
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assignment2 as a
+
+
+def random_word(generator:random.Random, alphabet:str = "abc", longest:int = 5) -> str:
+    return "".join(generator.choice(alphabet) for _ in range(generator.randint(1,longest)))
+
+
+def random_model(generator:random.Random, words:int, alphabet:str = "abc", longest:int = 5, highest:int = 8) -> dict:
+    """
+    A dictionary of word -> (definition, frequency) with at most words distinct words.
+    """
+    model = {}
+    for _ in range(words):
+        word = random_word(generator,alphabet,longest)
+        model[word] = ("d" + word,generator.randint(1,highest))
+    return model
+
+
+def records(model:dict) -> list:
+    return [[word,definition,frequency] for word,(definition,frequency) in model.items()]
+
+
+def best(model:dict, prefix:str) -> list:
+    """
+    The answer of prefix_search from model: the highest frequency, then the lexicographically smallest word.
+    """
+    candidates = sorted((-frequency,word) for word,(definition,frequency) in model.items() if word.startswith(prefix))
+    if not candidates:
+        return [None,None,0]
+    word = candidates[0][1]
+    return [word,model[word][0],len(candidates)]
+
+
+def insert_model(model:dict, word:str, definition:str, frequency:int) -> None:
+    """
+    Trie.insert on model: a word inserted again replaces its record only if no word which starts with it has a higher frequency.
+    """
+    if word not in model or max(count for other,(meaning,count) in model.items() if other.startswith(word)) <= frequency:
+        model[word] = (definition,frequency)
+
+
+def prefixes(model:dict, extra:tuple = ("","z","abd")) -> set:
+    return {word[:end] for word in model for end in range(len(word) + 1)} | set(extra)
+
+
+def test_compact_trie_matches_brute_force():
+    generator = random.Random(1)
+    for trial in range(100):
+        model = random_model(generator,generator.randint(1,30))
+        trie,compact = a.Trie(records(model)),a.CompactTrie(records(model))
+        for prefix in prefixes(model):
+            assert trie.prefix_search(prefix) == compact.prefix_search(prefix) == best(model,prefix),prefix
+
+    # A word inserted again follows the same replace or keep rule as Trie.
+    dictionary = [["ab","x",1],["abc","y",5],["ab","z",3],["b","w",2],["b","v",2]]
+    assert [a.CompactTrie(dictionary).prefix_search(prefix) for prefix in ("","a","ab","b")] == \
+           [a.Trie(dictionary).prefix_search(prefix) for prefix in ("","a","ab","b")]
+
+
+def test_compact_trie_bounds():
+    compact = a.CompactTrie([["ab","x",1],["ba","y",2],["bz","z",3]])
+    assert a.CompactTrie([]).prefix_search("") == [None,None,0]
+    for prefix in ("a{","b{","a`","A","é"):
+        assert compact.prefix_search(prefix) == [None,None,0]
+    with pytest.raises(ValueError):
+        compact.insert("aB",["aB","x",1])
+    assert compact.prefix_search("a") == ["ab","x",1]
+
+
+def test_radix_trie_matches_brute_force():
+    generator = random.Random(2)
+    for trial in range(100):
+        model = random_model(generator,generator.randint(1,30),longest=7)
+        trie,radix = a.Trie(records(model)),a.RadixTrie(records(model))
+        for prefix in prefixes(model):
+            assert trie.prefix_search(prefix) == radix.prefix_search(prefix) == best(model,prefix),prefix
+
+    dictionary = [["ab","x",1],["abc","y",5],["ab","z",3],["b","w",2],["b","v",2]]
+    assert [a.RadixTrie(dictionary).prefix_search(prefix) for prefix in ("","a","ab","b")] == \
+           [a.Trie(dictionary).prefix_search(prefix) for prefix in ("","a","ab","b")]
+
+
+def test_radix_trie_bounds():
+    radix = a.RadixTrie([["apple","a fruit",5],["apply","v",3],["ban","b",2]])
+    assert a.RadixTrie([]).prefix_search("") == [None,None,0]
+    for prefix in ("Ap","a{","b`","é"):
+        assert radix.prefix_search(prefix) == [None,None,0]
+    with pytest.raises(ValueError):
+        radix.insert("aB",["aB","x",1])
+    assert radix.prefix_search("ap") == ["apple","a fruit",2]
+    assert not isinstance(radix,a.Trie)
+
+
+@pytest.mark.parametrize("top_k",[1,3])
+def test_prefix_search_topk_matches_brute_force(top_k):
+    generator = random.Random(top_k)
+    for trial in range(30):
+        trie = a.Trie([],top_k=top_k)
+        model = {}
+        for step in range(60):
+            word = random_word(generator)
+            definition,frequency = "d%d" % step,generator.randint(1,6)
+            trie.insert(word,[word,definition,frequency])
+            insert_model(model,word,definition,frequency)
+        for prefix in prefixes(model):
+            expected = sorted((-frequency,word) for word,(definition,frequency) in model.items() if word.startswith(prefix))
+            for k in range(top_k + 1):
+                assert trie.prefix_search_topk(prefix,k) == [[word,model[word][0],-frequency] for frequency,word in expected[:k]]
+            if expected:
+                assert trie.prefix_search(prefix)[:2] == [expected[0][1],model[expected[0][1]][0]]
+    with pytest.raises(ValueError):
+        a.Trie([],top_k=top_k).prefix_search_topk("",top_k + 1)
+
+    trie = a.Trie([["ab","d1",1],["abc","d5",5],["ab","d3",3]],top_k=3)
+    assert trie.prefix_search_topk("a",3) == [["abc","d5",5],["ab","d1",1]]
+
+
+def test_prefix_search_iter_matches_brute_force():
+    generator = random.Random(4)
+    for trial in range(30):
+        trie = a.Trie([])
+        model = {}
+        for step in range(50):
+            word = random_word(generator)
+            definition,frequency = "d%d" % step,generator.randint(1,6)
+            trie.insert(word,[word,definition,frequency])
+            insert_model(model,word,definition,frequency)
+        for prefix in prefixes(model):
+            expected = sorted((-frequency,word) for word,(definition,frequency) in model.items() if word.startswith(prefix))
+            assert list(trie.prefix_search_iter(prefix)) == [[word,model[word][0],-frequency] for frequency,word in expected],prefix
+            first = next(trie.prefix_search_iter(prefix),None)
+            assert first == ([expected[0][1],model[expected[0][1]][0],-expected[0][0]] if expected else None)
+
+
+def test_prefix_search_many_matches_prefix_search():
+    generator = random.Random(5)
+    for trial in range(40):
+        model = random_model(generator,generator.randint(1,40))
+        trie = a.Trie(records(model))
+        searched = [random_word(generator,"abcd",4) for _ in range(60)] + sorted(prefixes(model))
+        generator.shuffle(searched)
+        assert trie.prefix_search_many(searched) == [best(model,prefix) for prefix in searched]
+    assert trie.prefix_search_many([]) == []
+
+
+@pytest.mark.parametrize("cache_size",[1,4,16])
+def test_cache_counters_follow_an_lru_model(cache_size):
+    generator = random.Random(cache_size)
+    model = random_model(generator,20)
+    cached = a.Trie(records(model),cache_size=cache_size)
+    lru = []
+    hits = misses = evictions = 0
+    for step in range(1500):
+        if generator.random() < 0.1:
+            word = random_word(generator)
+            definition,frequency = "n%d" % step,generator.randint(1,8)
+            cached.insert(word,[word,definition,frequency])
+            insert_model(model,word,definition,frequency)
+            lru = [prefix for prefix in lru if not word.startswith(prefix)]
+            continue
+        prefix = random_word(generator,"abcd",3)[:generator.randint(0,3)]
+        assert cached.prefix_search(prefix)[:2] == best(model,prefix)[:2],prefix
+        if prefix in lru:
+            hits += 1
+            lru.remove(prefix)
+            lru.append(prefix)
+        else:
+            misses += 1
+            if any(word.startswith(prefix) for word in model):
+                if len(lru) == cache_size:
+                    lru.pop(0)
+                    evictions += 1
+                lru.append(prefix)
+        assert cached.cache_info() == {"hits":hits,"misses":misses,"evictions":evictions,"size":len(lru),"max_size":cache_size}
+
+
+def test_typeahead_session_matches_prefix_search():
+    generator = random.Random(8)
+    for trial in range(40):
+        model = random_model(generator,generator.randint(1,30))
+        trie = a.Trie(records(model))
+        session = a.TypeaheadSession(trie)
+        typed = ""
+        for step in range(40):
+            if typed and generator.random() < 0.3:
+                session.pop()
+                typed = typed[:-1]
+            else:
+                char = generator.choice("abcd")
+                session.push(char)
+                typed += char
+            assert session.result() == trie.prefix_search(typed) == best(model,typed),typed
+        session.pop()
+    with pytest.raises(TypeError):
+        a.TypeaheadSession(a.RadixTrie([["a","x",1]]))
+    with pytest.raises(TypeError):
+        a.TypeaheadSession(a.CompactTrie([["a","x",1]]))
+
+
+@pytest.mark.parametrize("top_k,cache_size",[(0,0),(3,0),(0,4),(3,4)])
+def test_updates_and_deletes_rerank(top_k, cache_size):
+    generator = random.Random(top_k*10 + cache_size)
+    model = random_model(generator,60)
+    trie = a.Trie(records(model),top_k=top_k,cache_size=cache_size)
+
+    for step in range(600):
+        operation = generator.random()
+        if operation < 0.35 and model:
+            word = generator.choice(sorted(model))
+            frequency = generator.randint(1,8)
+            trie.update_frequency(word,frequency)
+            model[word] = (model[word][0],frequency)
+        elif operation < 0.6 and model:
+            word = generator.choice(sorted(model))
+            trie.delete(word)
+            del model[word]
+        else:
+            word = random_word(generator)
+            if word not in model:
+                model[word] = ("n" + word,generator.randint(1,8))
+                trie.insert(word,[word,model[word][0],model[word][1]])
+        if step % 40 == 0:
+            for prefix in prefixes(model):
+                assert trie.prefix_search(prefix) == best(model,prefix),prefix
+                if top_k:
+                    expected = sorted((-frequency,word) for word,(definition,frequency) in model.items() if word.startswith(prefix))[:top_k]
+                    assert trie.prefix_search_topk(prefix,top_k) == [[word,model[word][0],-frequency] for frequency,word in expected]
+
+    with pytest.raises(KeyError):
+        trie.delete("zzzz")
+    with pytest.raises(KeyError):
+        trie.update_frequency("zzzz",1)
+
+
+def test_find_path_follows_the_word():
+    trie = a.Trie([["ab","x",1],["abc","y",2],["b","z",3]])
+    path,previous = trie.find_path("abc")
+    assert path[0] is trie.root
+    assert path[-1] is trie.root.child("a").child("b").child("c")
+    assert len(previous) == len(path)
+    with pytest.raises(KeyError):
+        trie.find_path("ac")
+
+
+@pytest.mark.parametrize("processes",[0,2])
+def test_from_sorted_matches_brute_force(processes):
+    generator = random.Random(10)
+    model = random_model(generator,300,"abcdef",6)
+    trie = a.Trie.from_sorted(sorted(records(model)),top_k=3,processes=processes)
+    for prefix in prefixes(model):
+        assert trie.prefix_search(prefix) == best(model,prefix),prefix
+        expected = sorted((-frequency,word) for word,(definition,frequency) in model.items() if word.startswith(prefix))[:3]
+        assert trie.prefix_search_topk(prefix,3) == [[word,model[word][0],-frequency] for frequency,word in expected]
+
+    # The bulk built nodes take updates and deletes like inserted ones.
+    for word in sorted(model)[::7]:
+        trie.delete(word)
+        del model[word]
+    for word in sorted(model)[::5]:
+        model[word] = (model[word][0],generator.randint(1,8))
+        trie.update_frequency(word,model[word][1])
+    for prefix in prefixes(model):
+        assert trie.prefix_search(prefix) == best(model,prefix),prefix
+
+    with pytest.raises(ValueError):
+        a.Trie.from_sorted([["b","x",1],["a","y",2]])
+    with pytest.raises(ValueError):
+        a.Trie.from_sorted([["a","x",1],["a","y",2]])
+
+
+def test_snapshot_matches_trie(tmp_path):
+    generator = random.Random(11)
+    model = random_model(generator,200,"abcdef",6)
+    trie = a.Trie(records(model))
+    for word in sorted(model)[::6]:
+        trie.delete(word)
+        del model[word]
+    trie.save(str(tmp_path / "trie.snap"))
+    snapshot = a.Trie.open(str(tmp_path / "trie.snap"))
+    try:
+        for prefix in prefixes(model,("","z","abcdefa")):
+            assert snapshot.prefix_search(prefix) == best(model,prefix),prefix
+    finally:
+        snapshot.close()
+
+    (tmp_path / "other.snap").write_bytes(b"not a snapshot" * 8)
+    with pytest.raises(ValueError):
+        a.Trie.open(str(tmp_path / "other.snap"))
+
+
+@pytest.mark.parametrize("newline",["\n","\r\n"])
+def test_stream_dictionary_matches_load_dictionary(tmp_path, newline):
+    generator = random.Random(12)
+    model = random_model(generator,150,"abcdef",8)
+    path = tmp_path / "dictionary.txt"
+    with open(path,"w",encoding="utf-8",newline="") as outfile:
+        for word,(definition,frequency) in model.items():
+            outfile.write(f"word: {word}{newline}frequency: {frequency}{newline}definition: {definition} – naïve{newline}{newline}")
+
+    loaded = a.load_dictionary(str(path))
+    for chunk_size in (1,7,64,1 << 20):
+        assert list(a.stream_dictionary(str(path),chunk_size)) == loaded
+    trie,rate = a.load_trie(str(path),chunk_size=64)
+    expected = a.Trie(loaded)
+    for prefix in prefixes(model):
+        assert trie.prefix_search(prefix) == expected.prefix_search(prefix)
+    assert rate > 0
+
+
+def test_lazy_load_trie_matches_eager_load(tmp_path):
+    generator = random.Random(14)
+    model = random_model(generator,150,"abcdef",8)
+    path = tmp_path / "dictionary.txt"
+    with open(path,"w",encoding="utf-8",newline="") as outfile:
+        for word,(definition,frequency) in model.items():
+            outfile.write(f"word: {word}\nfrequency: {frequency}\ndefinition: {definition} – naïve\n\n")
+
+    eager,_ = a.load_trie(str(path),top_k=3)
+    lazy,_ = a.load_trie(str(path),top_k=3,lazy=True)
+    assert isinstance(lazy.definitions,a.DefinitionStore)
+    for prefix in prefixes(model):
+        assert lazy.prefix_search(prefix) == eager.prefix_search(prefix)
+        assert lazy.prefix_search_topk(prefix,3) == eager.prefix_search_topk(prefix,3)
+        assert list(lazy.prefix_search_iter(prefix)) == list(eager.prefix_search_iter(prefix))
+    lazy.definitions.close()
+
+
+def test_shared_trie_matches_trie():
+    generator = random.Random(15)
+    model = random_model(generator,200,"abcdé",6)
+    trie = a.Trie(records(model))
+    shared = a.SharedTrie(trie,processes=2,batch_size=16)
+    try:
+        queries = sorted(prefixes(model))
+        for prefix in queries:
+            assert shared.prefix_search(prefix) == trie.prefix_search(prefix)
+        assert shared.prefix_search_many(queries) == [trie.prefix_search(prefix) for prefix in queries]
+        assert shared.prefix_search_many([]) == []
+    finally:
+        shared.close()
+
+
+def test_stats_and_work_counters():
+    generator = random.Random(16)
+    model = random_model(generator,120,"abcd",6)
+    trie = a.Trie([],cache_size=4)
+    trie.count_work()
+    for word,definition,frequency in records(model):
+        trie.insert(word,[word,definition,frequency])
+    inserted = trie.work["nodes_visited"]
+    assert inserted == sum(len(word) + 1 for word in model)
+    assert trie.work["inserts"] == len(model)
+
+    stored = {word[:length] for word in model for length in range(len(word) + 1)}
+    visited = 0
+    for prefix in sorted(prefixes(model)) * 2:
+        cached = prefix in trie.cache
+        assert trie.prefix_search(prefix) == best(model,prefix)
+        if not cached:
+            visited += 1 + max(length for length in range(len(prefix) + 1) if prefix[:length] in stored)
+    assert trie.work["nodes_visited"] - inserted == visited
+    assert trie.work["string_bytes"] == 0
+
+    stats = trie.stats()
+    assert stats["nodes"] == len(stored)
+    assert stats["terminals"] == len(model)
+    assert stats["depth_histogram"] == [sum(len(prefix) == depth for prefix in stored) for depth in range(max(map(len,stored)) + 1)]
+    assert stats["work"] is trie.work
+    trie.count_work(False)
+    assert trie.stats()["work"] is None
+
+
+def test_substring_search_matches_brute_force():
+    generator = random.Random(17)
+    dictionary = []
+    model = {}
+    for _ in range(300):
+        word = random_word(generator,"abcd",7)
+        definition = f"d{len(dictionary)}"
+        frequency = generator.randint(1,8)
+        dictionary.append((word,definition,frequency))
+        if word not in model or model[word][1] <= frequency:
+            model[word] = (definition,frequency)
+    index = a.SubstringIndex(dictionary)
+    infixes = {word[start:end] for word in model for start in range(len(word)) for end in range(start,len(word) + 1)}
+    for infix in sorted(infixes | {"","e","dddddddd"}):
+        candidates = sorted((-frequency,word) for word,(definition,frequency) in model.items() if infix in word)
+        expected = [candidates[0][1],model[candidates[0][1]][0],len(candidates)] if candidates else [None,None,0]
+        assert index.substring_search(infix) == expected
+
+
+def test_children_switch_between_sparse_and_dense():
+    node = a.Node()
+    children = {}
+    generator = random.Random(13)
+    letters = [chr(code) for code in range(ord("a"),ord("z") + 1)]
+    generator.shuffle(letters)
+    for char in letters:
+        children[char] = a.Node()
+        node.add_child(char,children[char])
+    assert node.keys is None
+    for char in letters[:-3]:
+        node.remove_child(char)
+        del children[char]
+    assert node.keys is not None
+    for char in "abcdefghijklmnopqrstuvwxyz{":
+        assert node.child(char) is children.get(char)
+
+    for trial in range(200):
+        char = chr(generator.randint(ord("a"),ord("z") + 5))
+        if char in children and generator.random() < 0.5:
+            node.remove_child(char)
+            del children[char]
+        else:
+            children[char] = a.Node()
+            node.add_child(char,children[char])
+        for code in range(ord("a") - 1,ord("z") + 7):
+            assert node.child(chr(code)) is children.get(chr(code))
+
+
+def test_unicode_words():
+    generator = random.Random(1)
+    model = {}
+    for _ in range(800):
+        word = random_word(generator,"aAbZ9é中😀-",6)
+        model[word] = ("d" + word,generator.randint(1,50))
+    dictionary = [[word,definition,frequency] for word,(definition,frequency) in model.items()]
+    trie = a.Trie(dictionary)
+    ordered = a.Trie.from_sorted(sorted(dictionary))
+    for prefix in prefixes(model,("x","中中中")):
+        assert trie.prefix_search(prefix) == best(model,prefix) == ordered.prefix_search(prefix),prefix
+    for word in sorted(model)[:300]:
+        if generator.random() < 0.5:
+            trie.delete(word)
+            del model[word]
+        else:
+            model[word] = (model[word][0],generator.randint(1,50))
+            trie.update_frequency(word,model[word][1])
+    for prefix in prefixes(model,("x","中中中")):
+        assert trie.prefix_search(prefix) == best(model,prefix),prefix
+
+
+def distance(first:str, second:str) -> int:
+    row = list(range(len(second) + 1))
+    for i in range(1,len(first) + 1):
+        previous,row[0] = row[0],i
+        for j in range(1,len(second) + 1):
+            previous,row[j] = row[j],min(row[j] + 1,row[j-1] + 1,previous + (first[i-1] != second[j-1]))
+    return row[-1]
+
+
+@pytest.mark.parametrize("max_edits",[0,1,2])
+def test_fuzzy_prefix_search_matches_brute_force(max_edits):
+    generator = random.Random(14 + max_edits)
+    for trial in range(15):
+        model = random_model(generator,generator.randint(1,40),"abcd",5)
+        trie = a.Trie(records(model))
+        for prefix in [random_word(generator,"abcde",4) for _ in range(20)] + [""]:
+            matching = {word:entry for word,entry in model.items()
+                        if any(distance(word[:end],prefix) <= max_edits for end in range(len(word) + 1))}
+            assert trie.fuzzy_prefix_search(prefix,max_edits) == best(matching,""),(prefix,max_edits)
+    with pytest.raises(ValueError):
+        trie.fuzzy_prefix_search("a",-1)
+
+
+def test_versioned_trie_copy_on_write():
+    generator = random.Random(2)
+    base = [[word,"d" + word,generator.randint(1,20)] for word in sorted({random_word(generator,"abcd") for _ in range(200)})]
+    versioned = a.VersionedTrie(base,top_k=2)
+    trie = a.Trie(base,top_k=2)
+    words = [data[0] for data in base]
+    searched = sorted({word[:end] for word in words for end in range(len(word) + 1)})
+
+    for step in range(300):
+        old_root,old_version = versioned.root,versioned.version
+        before = [versioned.prefix_search(prefix) for prefix in searched[:40]]
+        operation = generator.random()
+        if operation < 0.4:
+            word = random_word(generator,"abcd")
+            data = [word,"n" + word,generator.randint(1,20)]
+            versioned.insert(word,data)
+            trie.insert(word,list(data))
+            words.append(word)
+        else:
+            word = generator.choice(words)
+            method = "delete" if operation < 0.7 else "update_frequency"
+            arguments = (word,) if method == "delete" else (word,generator.randint(1,20))
+            try:
+                getattr(trie,method)(*arguments)
+            except KeyError:
+                with pytest.raises(KeyError):
+                    getattr(versioned,method)(*arguments)
+                continue
+            getattr(versioned,method)(*arguments)
+        assert versioned.root is not old_root
+        assert versioned.version == old_version + 1
+
+        # The published root of the previous version answers exactly as before the write.
+        current = versioned.root
+        versioned.root = old_root
+        assert [versioned.prefix_search(prefix) for prefix in searched[:40]] == before
+        versioned.root = current
+
+        if step % 50 == 0:
+            for prefix in searched:
+                assert versioned.prefix_search(prefix) == trie.prefix_search(prefix)
+                assert versioned.prefix_search_topk(prefix,2) == trie.prefix_search_topk(prefix,2)
+
+    with pytest.raises(ValueError):
+        a.VersionedTrie([],cache_size=3)
+
+
+@pytest.mark.parametrize("build",["init","from_sorted","insert"])
+def test_frequency_order_counts(build):
+    generator = random.Random(len(build))
+    model = {}
+    for _ in range(40):
+        word = random_word(generator)
+        model[word] = ("d" + word,generator.randint(0,10))
+    dictionary = sorted([word,definition,frequency] for word,(definition,frequency) in model.items())
+    if build == "init":
+        trie = a.Trie(dictionary,frequency_order=True)
+    elif build == "from_sorted":
+        trie = a.Trie.from_sorted(dictionary,frequency_order=True)
+    else:
+        trie = a.Trie([],frequency_order=True)
+        for data in dictionary:
+            trie.insert(data[0],data)
+
+    for step in range(200):
+        operation = generator.random()
+        if operation < 0.4:
+            word = random_word(generator)
+            if word not in model:
+                model[word] = ("n" + word,generator.randint(0,10))
+                trie.insert(word,[word,model[word][0],model[word][1]])
+        elif operation < 0.7 and model:
+            word = generator.choice(sorted(model))
+            model[word] = (model[word][0],generator.randint(0,10))
+            trie.update_frequency(word,model[word][1])
+        elif model:
+            word = generator.choice(sorted(model))
+            trie.delete(word)
+            del model[word]
+        if step % 20 == 0:
+            for prefix in ("","a","ab","b","ca","ccc","z"):
+                for frequency in range(0,12,3):
+                    assert trie.count_at_least(prefix,frequency) == sum(1 for word,(definition,count) in model.items()
+                                                                          if word.startswith(prefix) and count >= frequency)
+                for low,high in ((0,10),(3,5),(6,6),(9,2)):
+                    in_range = {word:entry for word,entry in model.items() if low <= entry[1] <= high}
+                    assert trie.best_in_range(prefix,low,high) == best(in_range,prefix),(prefix,low,high)
+
+    with pytest.raises(ValueError):
+        a.Trie([["a","x",1]]).count_at_least("a",0)
+    with pytest.raises(ValueError):
+        a.VersionedTrie([["a","x",1]],frequency_order=True)
+    with pytest.raises(ValueError):
+        a.VersionedTrie.from_sorted([["a","x",1]],frequency_order=True)
+
+
+def valid_allocation(allocation:list, preferences:list, licenses:list) -> bool:
+    """
+    licenses is a list of booleans by person. Every person is in exactly one car of a destination they prefer,
+    each car has at most 5 people and at least 2 of them own a license.
+    """
+    seen = []
+    for destination,group in enumerate(allocation):
+        if len(group) > 5 or sum(1 for person in group if licenses[person]) < 2:
+            return False
+        if any(destination not in preferences[person] for person in group):
+            return False
+        seen += group
+    return sorted(seen) == list(range(len(preferences)))
+
+
+def random_instance(generator:random.Random, people:int) -> tuple[list,list]:
+    destinations = math.ceil(people/5)
+    preferences = [generator.sample(range(destinations),generator.randint(1,destinations)) for _ in range(people)]
+    licenses = generator.sample(range(people),generator.randint(people//3,people))
+    return preferences,licenses
+
+
+def test_solvers_agree():
+    generator = random.Random(4)
+    for trial in range(80):
+        preferences,licenses = random_instance(generator,generator.randint(2,30))
+        owns = [person in licenses for person in range(len(preferences))]
+        answers = [a.allocate(preferences,licenses,solver) for solver in ("dfs","edmonds_karp","dinic","push_relabel")]
+        assert len({answer is None for answer in answers}) == 1
+        for answer in answers:
+            if answer is not None:
+                assert valid_allocation(answer,preferences,owns)
+    with pytest.raises(ValueError):
+        a.allocate([[0]],[0],"simplex")
+
+
+def max_flow(capacity:list, source:int, sink:int) -> int:
+    """
+    Edmonds-Karp on an adjacency matrix of capacities, the oracle for the solvers on general networks.
+    """
+    residual = [row[:] for row in capacity]
+    total = 0
+    while True:
+        previous = [-1]*len(residual)
+        previous[source] = source
+        queue = [source]
+        for u in queue:
+            for v in range(len(residual)):
+                if residual[u][v] > 0 and previous[v] < 0:
+                    previous[v] = u
+                    queue.append(v)
+        if previous[sink] < 0:
+            return total
+        flow = None
+        v = sink
+        while v != source:
+            flow = residual[previous[v]][v] if flow is None else min(flow,residual[previous[v]][v])
+            v = previous[v]
+        v = sink
+        while v != source:
+            residual[previous[v]][v] -= flow
+            residual[v][previous[v]] += flow
+            v = previous[v]
+        total += flow
+
+
+@pytest.mark.parametrize("solver",["dinic","push_relabel"])
+def test_solvers_find_maximum_flow_on_general_networks(solver):
+    generator = random.Random(5)
+    for trial in range(150):
+        vertices = generator.randint(1,20)
+        source,sink = vertices,vertices + 1
+        graph = a.FlowGraph([],[],vertices)
+        capacity = [[0]*(vertices + 2) for _ in range(vertices + 2)]
+        edges = []
+        for _ in range(generator.randint(0,4*vertices)):
+            u = generator.choice([source] + list(range(vertices)))
+            v = generator.choice([sink] + list(range(vertices)))
+            if u != v:
+                amount = generator.randint(1,9)
+                graph.formEdge(u,v,amount)
+                capacity[u][v] += amount
+                edges.append((u,v,amount,graph.last_edge[u]))
+        graph.residual_network.compact()
+        if solver == "dinic":
+            while graph.residual_network.level_graph():
+                graph.residual_network.blocking_flow()
+        else:
+            graph.residual_network.push_relabel()
+        expected = max_flow(capacity,source,sink)
+        into = [0]*(vertices + 2)
+        out = [0]*(vertices + 2)
+        for u,v,amount,number in edges:
+            flow = graph.residual_network.flow(number)
+            assert 0 <= flow <= amount
+            out[u] += flow
+            into[v] += flow
+        assert out[source] == expected
+        assert all(into[u] == out[u] for u in range(vertices))
+        assert into[sink] == expected
+
+
+@pytest.mark.parametrize("solver",["dfs","dinic","push_relabel"])
+def test_allocator_matches_fresh_allocate(solver):
+    generator = random.Random(solver)
+    for trial in range(25):
+        preferences,licenses = random_instance(generator,generator.randint(2,25))
+        allocator = a.Allocator(preferences,licenses,solver)
+        for step in range(15):
+            answer = allocator.allocate()
+            owns = allocator.licenses
+            fresh = a.allocate(allocator.preferences,[person for person in range(len(owns)) if owns[person]],solver)
+            assert (answer is None) == (fresh is None)
+            if answer is not None:
+                assert valid_allocation(answer,allocator.preferences,owns)
+
+            people = len(allocator.preferences)
+            destinations = math.ceil(people/5)
+            operation = generator.random()
+            if operation < 0.2:
+                grown = math.ceil((people + 1)/5)
+                allocator.add_person(generator.sample(range(grown),generator.randint(1,grown)),generator.random() < 0.6)
+            elif operation < 0.4 and people > 1:
+                allocator.remove_person(generator.randrange(people))
+                assert all(destination < math.ceil((people - 1)/5) for preference in allocator.preferences for destination in preference)
+            elif operation < 0.6:
+                allocator.add_preference(generator.randrange(people),generator.randrange(destinations))
+            elif operation < 0.8:
+                person = generator.randrange(people)
+                if len(allocator.preferences[person]) > 1:
+                    allocator.remove_preference(person,generator.choice(allocator.preferences[person]))
+            else:
+                allocator.toggle_license(generator.randrange(people))
+
+    allocator = a.Allocator([[0],[0],[0],[1],[1],[1]],[0,1,3,4],solver)
+    assert allocator.allocate() is not None
+    allocator.remove_person(0)
+    assert allocator.preferences == [[0],[0],[],[],[]]
+    assert allocator.allocate() is None
+    with pytest.raises(ValueError):
+        allocator.add_preference(0,1)
+    with pytest.raises(ValueError):
+        allocator.add_person([0,2])
+
+
+def test_allocator_seed_is_a_valid_flow():
+    generator = random.Random(8)
+    for trial in range(100):
+        preferences,licenses = random_instance(generator,generator.randint(2,30))
+        allocator = a.Allocator(preferences,licenses,"dinic")
+        allocator.allocate()
+        for _ in range(3):
+            person = generator.randrange(len(allocator.preferences))
+            if generator.random() < 0.5:
+                allocator.toggle_license(person)
+            else:
+                allocator.add_person(generator.sample(range(math.ceil((len(allocator.preferences) + 1)/5)),1),generator.random() < 0.5)
+        people = len(allocator.preferences)
+        edge,begin,terminate = a.weekend_gateaway(allocator.preferences,[person for person in range(people) if allocator.licenses[person]])
+        flows = allocator.seed(edge)
+
+        graph = a.FlowGraph(begin,terminate,max(max(u,v) for u,v,capacity in edge) + 1)
+        for u,v,capacity in edge:
+            graph.formEdge(u,v,capacity)
+        graph.superSource()
+        graph.superSink()
+        network = graph.residual_network
+        network.compact()
+        for number,flow in flows:
+            network.set_flow(number,flow)
+
+        balance = {}
+        for number in range(len(network.front)):
+            arc = network.front[number]
+            flow = network.flow(number)
+            assert 0 <= flow <= network.capacity[arc]
+            balance[network.tail[arc]] = balance.get(network.tail[arc],0) - flow
+            balance[network.head[arc]] = balance.get(network.head[arc],0) + flow
+        for vertex,total in balance.items():
+            if vertex not in (graph.super_source,graph.super_sink):
+                assert total == 0,(vertex,total)